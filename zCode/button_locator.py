@@ -13,9 +13,9 @@ FUNCIONALIDADE:
 
 PARÂMETROS ESTÁTICOS (hardcoded):
     - margin = 100 (área de validação LLM)
-    - threshold = 0.7 (confiança mínima template matching)
+    - threshold = 0.7 (confiança mínima template matching, por template em buttons/manifest.json)
     - confidence > 0.5 (confiança mínima OCR)
-    - Idiomas OCR: ['pt', 'en']
+    - Idiomas OCR: ['pt', 'en'] (leitor compartilhado via ocr_readers.py)
 
 PARÂMETROS DINÂMICOS (você passa):
     - llm_model: Modelo Ollama (padrão: "gemma3:12b")
@@ -34,14 +34,23 @@ MÉTODOS PRINCIPAIS:
        └─ Encontra TODOS os matches de um template (ex: múltiplos sliders)
        └─ Retorna: {'found': bool, 'matches': [{'x', 'y', 'confidence'}]}
 
-    3. list_items_below(parent_name)
-       └─ Lista itens abaixo de um elemento pai (ex: clusters abaixo de "Scans")
+    3. list_items_below(parent_name) / list_clusters()
+       └─ Lista clusters (ex: abaixo de "Scans") pelo OCR + regex Cluster_N
+       └─ LLM só como fallback quando a leitura do OCR é fraca
        └─ Retorna: dict com {nome_item: {'x': int, 'y': int}}
 
     4. check_text_on_screen(text)
        └─ Verifica se um texto está na tela usando OCR
        └─ Retorna: True se confiança > 0.5, False caso contrário
 
+    5. read_report()
+       └─ Lê EPM/MEP/SM do relatório ancorando nos rótulos (report_reader.py)
+       └─ Retorna: ReportRecord (epm, mep, sm + confiança de cada um)
+
+    6. ocr_index(screenshot=None)
+       └─ Uma leitura OCR do frame, reaproveitada por todas as consultas
+       └─ Retorna: OCRIndex (exact, contains, fuzzy, regex — ver ocr_index.py)
+
 EXEMPLOS DE USO:
 
     # Inicializar
@@ -85,7 +94,7 @@ LIMITAÇÕES:
     ⚠️ LLM é lento: Validação adiciona ~2-5s por botão
 
 DEPENDÊNCIAS:
-    - pyautogui (captura tela)
+    - PIL ImageGrab (captura tela)
     - easyocr (OCR)
     - ollama (LLM Vision)
     - PIL (manipulação imagem)
@@ -96,103 +105,199 @@ DEPENDÊNCIAS:
 
 
 
-import pyautogui
-import easyocr
-import ollama
 from PIL import ImageGrab
 import cv2
-import numpy as np
+from ocr_readers import get_reader
+from frame import as_frame, capture_frame
+from screen_regions import resolve_region
+from template_registry import templates
+from matching import match_template
+from location_cache import location_cache
+from ocr_index import OCRIndex
+from ocr_engines import engine_for
+from cluster_names import parse_cluster_name, scan_clusters
+from report_reader import report_reader, parse_number
+
+def _ollama():
+    """ollama só é importado na primeira conversa com o LLM"""
+    import ollama
+    return ollama
+
 
 class ButtonLocator:
+    OCR_LANGUAGES = ('pt', 'en')
+
+    # Abaixo disso, a lista de clusters do OCR é conferida com o LLM
+    CLUSTER_MIN_CONFIDENCE = 0.5
+
     def __init__(self, llm_model="gemma3:12b"):
         self.llm_model = llm_model
-        self.ocr_reader = easyocr.Reader(['pt', 'en'])
         self.last_found_coords = None
         self.last_ocr_coords = None
-
-    def capture_screen(self):
-        """Captura screenshot da tela"""
-        screenshot = ImageGrab.grab()
-        return screenshot
+        self._ocr_index = None
+        self._ocr_index_key = None
+
+    @property
+    def ocr_reader(self):
+        """Leitor EasyOCR compartilhado (carregado só no primeiro uso do processo)"""
+        return get_reader(self.OCR_LANGUAGES)
+
+    def capture_screen(self, region=None):
+        """Captura screenshot da tela (ou só de uma região, ver screen_regions.py)"""
+        bounds = resolve_region(region)
+        if bounds is None:
+            return ImageGrab.grab()
+        left, top, width, height = bounds
+        return ImageGrab.grab(bbox=(left, top, left + width, top + height))
+
+    def capture_frame(self, name="frame", region=None):
+        """
+        Captura a tela direto para um Frame em memória (BGR).
+        region: None (tela inteira), (left, top, width, height), 'scene' ou nome de painel
+        """
+        return capture_frame(name, region)
     
 
+    def ocr_index(self, screenshot=None, region=None, task='button_text'):
+        """
+        Índice com tudo o que o OCR leu no frame (ocr_index.py), com o motor
+        da tarefa (ocr_engines.py: 'button_text' ou 'cluster_names').
+        Consultas seguidas no mesmo Frame reaproveitam a mesma leitura.
+        Sem screenshot, captura a tela (ou a região) agora.
+        """
+        frame = as_frame(screenshot) if screenshot is not None else self.capture_frame("ocr", region)
+        if (frame, task) != self._ocr_index_key:
+            self._ocr_index = OCRIndex.build(frame, engine_for(task))
+            self._ocr_index_key = (frame, task)
+        return self._ocr_index
+
     def find_text_with_ocr(self, screenshot, target_text):
-        """Encontra texto na tela e retorna coordenadas aproximadas"""
-        img_array = np.array(screenshot)
-        results = self.ocr_reader.readtext(img_array)
-        for (bbox, text, confidence) in results:
-            if target_text.lower() in text.lower():
-                x_coords = [point[0] for point in bbox]
-                y_coords = [point[1] for point in bbox]
-                center_x = sum(x_coords) / 4
-                center_y = sum(y_coords) / 4
-                return {
-                    'found': True,
-                    'x': int(center_x),
-                    'y': int(center_y),
-                    'confidence': confidence,
-                    'bbox': bbox
-                }
-        return {'found': False}
+        """Encontra texto na tela e retorna coordenadas aproximadas (em espaço de tela)"""
+        word = self.ocr_index(screenshot).find(target_text)
+        if word is None:
+            return {'found': False}
+        return {
+            'found': True,
+            'x': word['x'],
+            'y': word['y'],
+            'confidence': word['confidence'],
+            'bbox': word['bbox']
+        }
+
+    def check_text_on_screen(self, text, screenshot=None, region=None, min_confidence=0.5, fuzzy_cutoff=None):
+        """Verifica se um texto está na tela (OCR com confiança > min_confidence)"""
+        index = self.ocr_index(screenshot, region)
+        return index.find(text, min_confidence=min_confidence, fuzzy_cutoff=fuzzy_cutoff) is not None
+
+    def _ask_llm_for_items(self, frame, prompt):
+        """Manda o frame para o LLM e devolve as linhas da resposta"""
+        ok, png = cv2.imencode('.png', frame.image)
+        response = _ollama().chat(
+            model=self.llm_model,
+            messages=[{
+                'role': 'user',
+                'content': prompt,
+                'images': [png.tobytes()]
+            }]
+        )
+        items_text = response['message']['content'].strip()
+        return [item.strip() for item in items_text.split('\n') if item.strip()]
+
+    def _coords_of_items(self, index, items_list):
+        """Coordenadas (tela) de cada item pelo índice OCR (confiança > 0.5)"""
+        items_dict = {}
+        for item_name in items_list:
+            word = index.find(item_name, min_confidence=0.5)
+            if word is not None:
+                items_dict[item_name] = {'x': word['x'], 'y': word['y']}
+        return items_dict
 
     def validate_with_llm(self, screenshot, region, button_name):
         """Valida se a região contém o botão usando Vision LLM"""
-        x, y = region['x'], region['y']
+        frame = as_frame(screenshot)
+        # region vem em coordenadas de tela; o recorte é feito no frame
+        x = region['x'] - frame.origin[0]
+        y = region['y'] - frame.origin[1]
         margin = 100
-        cropped = screenshot.crop((
-            max(0, x - margin),
-            max(0, y - margin),
-            x + margin,
-            y + margin
-        ))
-        cropped.save('temp_region.png')
+        cropped = frame.crop(x - margin, y - margin, x + margin, y + margin)
+        ok, png = cv2.imencode('.png', cropped)
         prompt = f"Nesta imagem, existe um botão com o texto '{button_name}'? Responda apenas 'sim' ou 'não'."
-        response = ollama.chat(
+        response = _ollama().chat(
             model=self.llm_model,
             messages=[{
                 'role': 'user',
                 'content': prompt,
-                'images': ['temp_region.png']
+                'images': [png.tobytes()]
             }]
         )
         answer = response['message']['content'].lower()
         return 'sim' in answer
 
-    def find_with_template(self, screenshot, template_path):
-        """Tenta localizar usando template matching"""
-        screen_cv = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
-        template = cv2.imread(template_path)
+    def find_with_template(self, screenshot, template_path, threshold=None):
+        """
+        Tenta localizar usando template matching (screenshot: Frame, PIL ou array BGR).
+        template_path: nome do template em buttons/ ou caminho do PNG.
+        threshold: se None, usa o do manifest.json.
+        As coordenadas retornadas já estão em espaço de tela.
+        """
+        frame = as_frame(screenshot)
+        template = templates.get(template_path)
 
         if template is None:
             return {'found': False}
 
-        result = cv2.matchTemplate(screen_cv, template, cv2.TM_CCOEFF_NORMED)
-        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+        # Busca grosso-fino em cinza, na escala já medida para esta tela (matching.py)
+        matches = match_template(frame, template, threshold)
 
-        if max_val > 0.7:
-            template_h, template_w = template.shape[:2]
-            center_x = max_loc[0] + template_w // 2
-            center_y = max_loc[1] + template_h // 2
+        if matches:
+            best = matches[0]
+            center_x, center_y = frame.to_screen(best['x'] + best['width'] // 2, best['y'] + best['height'] // 2)
             return {
                 'found': True,
                 'x': center_x,
                 'y': center_y,
-                'confidence': max_val
+                'confidence': best['confidence']
             }
         return {'found': False}
 
-    def locate_tm(self, button_name, use_template=None, validate_llm=True):
-        """Localiza o botão sem clicar: Template primeiro, depois OCR+LLM"""
+    def locate_tm(self, button_name, use_template=None, validate_llm=True, region=None):
+        """
+        Localiza o botão sem clicar: Template primeiro, depois OCR+LLM.
+        Com template, tenta antes uma janelinha em volta da última posição
+        conhecida (location_cache.py). Depois, region limita a busca a um
+        retângulo/painel (se None, usa a região do manifest.json); se o
+        template não aparecer lá, tenta na tela inteira.
+        """
         print(f"🔍 Procurando botão: {button_name}")
 
-        screenshot = self.capture_screen()
+        template = templates.get(use_template) if use_template else None
+        if region is None and template is not None:
+            region = template.region
+
+        if template is not None:
+            prior = location_cache.search_region(template)
+            if prior is not None:
+                template_result = self.find_with_template(self.capture_frame(region=prior), template)
+                if template_result['found']:
+                    print(f"✓ Template encontrado na última posição: ({template_result['x']}, {template_result['y']})")
+                    self.last_found_coords = template_result
+                    location_cache.remember(template, template_result['x'], template_result['y'])
+                    return template_result
+
+        screenshot = self.capture_frame(region=region)
 
         if use_template:
             print("🔍 Tentando Template Matching...")
             template_result = self.find_with_template(screenshot, use_template)
+            if not template_result['found'] and region is not None:
+                print("🔍 Fora da região esperada, tentando na tela inteira...")
+                screenshot = self.capture_frame()
+                template_result = self.find_with_template(screenshot, use_template)
             if template_result['found']:
                 print(f"✓ Template encontrado em: ({template_result['x']}, {template_result['y']})")
                 self.last_found_coords = template_result
+                if template is not None:
+                    location_cache.remember(template, template_result['x'], template_result['y'])
                 return template_result
             else:
                 print("❌ Template não encontrou")
@@ -217,162 +322,128 @@ class ButtonLocator:
         self.last_found_coords = ocr_result
         return True
     
-    def list_items_below(self, parent_name):
-        """Lista todos os itens abaixo de um item pai usando LLM + OCR"""
-        print(f"🔍 Listando itens abaixo de '{parent_name}'...")
+    def _weak_read(self, clusters):
+        """O OCR não achou nada ou leu algum nome com confiança baixa"""
+        return not clusters or min(c['confidence'] for c in clusters.values()) < self.CLUSTER_MIN_CONFIDENCE
 
-        screenshot = self.capture_screen()
-        screenshot.save('temp_list.png')
+    def _needs_llm(self, clusters, missed):
+        """LLM só entra se a leitura for fraca ou se sobrou palavra "cluster" que não virou nome"""
+        return self._weak_read(clusters) or bool(missed)
 
-        # LLM identifica quais itens estão abaixo
-        prompt = f"""Nesta imagem, quais itens estão abaixo de '{parent_name}'? 
-        Liste apenas os itens que contem "Cluster", um por linha, sem numeração ou símbolos."""
+    def _with_llm_items(self, clusters, index, items_list):
+        """
+        Junta a resposta do LLM à leitura do OCR. Leitura fraca: vale a lista
+        do LLM. Só faltaram alguns: o LLM completa os nomes que o OCR perdeu.
+        """
+        llm_items = self._coords_of_items(index, items_list)
+        if not llm_items:
+            return clusters
+        if self._weak_read(clusters):
+            return llm_items
+
+        combined = dict(clusters)
+        for name, coords in llm_items.items():
+            combined.setdefault(parse_cluster_name(name) or name, coords)
+        return dict(sorted(combined.items(), key=lambda item: item[1]['y']))
+
+    def list_items_below(self, parent_name, llm_fallback=True):
+        """
+        Lista os clusters abaixo de um item pai (ex.: "Scans") direto do OCR
+        (regex Cluster_N, tolerante a l/1 e O/0 — ver cluster_names.py).
+        O LLM só é consultado se a leitura do OCR for fraca ou incompleta.
+        """
+        print(f"🔍 Listando itens abaixo de '{parent_name}'...")
 
-        response = ollama.chat(
-            model=self.llm_model,
-            messages=[{
-                'role': 'user',
-                'content': prompt,
-                'images': ['temp_list.png']
-            }]
-        )
+        frame = self.capture_frame("lista")
+        index = self.ocr_index(frame, task='cluster_names')
 
-        items_text = response['message']['content'].strip()
-        items_list = [item.strip() for item in items_text.split('\n') if item.strip()]
+        parent = index.find(parent_name, min_confidence=0.3, fuzzy_cutoff=0.8)
+        if parent is None:
+            print(f"⚠️  '{parent_name}' não encontrado pelo OCR, considerando a tela toda")
+        items_dict, missed = scan_clusters(index, below=parent)
+        print(f"✓ OCR encontrou {len(items_dict)} clusters: {list(items_dict)}")
 
-        print(f"✓ LLM encontrou {len(items_list)} itens: {items_list}")
+        if llm_fallback and self._needs_llm(items_dict, missed):
+            print(f"🤖 Leitura fraca ou incompleta (não lidos: {missed}), confirmando com o LLM...")
+            prompt = f"""Nesta imagem, quais itens estão abaixo de '{parent_name}'? 
+            Liste apenas os itens que contem "Cluster", um por linha, sem numeração ou símbolos."""
 
-        # OCR extrai coordenadas de cada item
-        img_array = np.array(screenshot)
-        ocr_results = self.ocr_reader.readtext(img_array)
+            items_list = self._ask_llm_for_items(frame, prompt)
+            print(f"✓ LLM encontrou {len(items_list)} itens: {items_list}")
+            items_dict = self._with_llm_items(items_dict, index, items_list)
 
-        items_dict = {}
-        for item_name in items_list:
-            for (bbox, text, confidence) in ocr_results:
-                if item_name.lower() in text.lower() and confidence > 0.5:
-                    x_coords = [point[0] for point in bbox]
-                    y_coords = [point[1] for point in bbox]
-                    center_x = int(sum(x_coords) / 4)
-                    center_y = int(sum(y_coords) / 4)
-
-                    items_dict[item_name] = {
-                        'x': center_x,
-                        'y': center_y
-                    }
         print(f"✓ Coordenadas extraídas: {items_dict}")
         return items_dict
     
 
 
-    def list_clusters(self):
+    def list_clusters(self, llm_fallback=True):
+        """
+        Lista os clusters da página inicial direto do OCR (regex Cluster_N).
+        O LLM só é consultado se a leitura do OCR for fraca ou incompleta.
+        """
         print(f"🔍 Listando clusters da pagina inicial...")
 
-        screenshot = self.capture_screen()
-        screenshot.save('temp_list.png')
+        frame = self.capture_frame("lista")
+        index = self.ocr_index(frame, task='cluster_names')
 
-        # LLM identifica quais itens estão abaixo
-        prompt = f"""Nesta imagem, quantos Clusters temos? Eles podem ser identificados com a seguinte 
-        nomenclatura: "Cluster_2", "Cluster_34", Cluster_133". Retorne apenas os nomes de cada Cluster e nada mais."""
+        items_dict, missed = scan_clusters(index)
+        print(f"✓ OCR encontrou {len(items_dict)} clusters: {list(items_dict)}")
 
-        response = ollama.chat(
-            model=self.llm_model,
-            messages=[{
-                'role': 'user',
-                'content': prompt,
-                'images': ['temp_list.png']
-            }]
-        )
-
-        items_text = response['message']['content'].strip()
-        items_list = [item.strip() for item in items_text.split('\n') if item.strip()]
+        if llm_fallback and self._needs_llm(items_dict, missed):
+            print(f"🤖 Leitura fraca ou incompleta (não lidos: {missed}), confirmando com o LLM...")
+            prompt = f"""Nesta imagem, quantos Clusters temos? Eles podem ser identificados com a seguinte 
+            nomenclatura: "Cluster_2", "Cluster_34", Cluster_133". Retorne apenas os nomes de cada Cluster e nada mais."""
 
-        print(f"✓ LLM encontrou {len(items_list)} itens: {items_list}")
+            items_list = self._ask_llm_for_items(frame, prompt)
+            print(f"✓ LLM encontrou {len(items_list)} itens: {items_list}")
+            items_dict = self._with_llm_items(items_dict, index, items_list)
 
-        # OCR extrai coordenadas de cada item
-        img_array = np.array(screenshot)
-        ocr_results = self.ocr_reader.readtext(img_array)
+            print(f"📝 Tudo que o OCR detectou:")
+            for word in index.words:
+                print(f"  - '{word['text']}' (confiança: {word['confidence']:.2f})")
 
-        items_dict = {}
-        
-        for item_name in items_list:
-            for (bbox, text, confidence) in ocr_results:
-                # Normaliza o texto do OCR corrigindo erros comuns
-                if item_name.lower() in text.lower() and confidence > 0.5:
-                    x_coords = [point[0] for point in bbox]
-                    y_coords = [point[1] for point in bbox]
-                    center_x = int(sum(x_coords) / 4)
-                    center_y = int(sum(y_coords) / 4)
-
-                    items_dict[item_name] = {
-                        'x': center_x,
-                        'y': center_y
-                    }
         print(f"✓ Coordenadas extraídas: {items_dict}")
-        print(f"📝 Tudo que o OCR detectou:")
-        for (bbox, text, confidence) in ocr_results:
-            print(f"  - '{text}' (confiança: {confidence:.2f})")
         return items_dict
 
 
 
 
-    def find_all_with_template(self, screenshot, template_path, threshold=0.7):
+    def find_all_with_template(self, screenshot, template_path, threshold=None):
         """
         Encontra TODOS os matches de um template na screenshot.
+        template_path: nome do template em buttons/ ou caminho do PNG.
+        threshold: se None, usa o do manifest.json.
         Retorna uma lista com as coordenadas de todos os matches encontrados.
         """
         try:
-            # Carrega a imagem e o template
-            if isinstance(screenshot, str):
-                img = cv2.imread(screenshot)
-            else:
-                img = np.array(screenshot)
+            # Carrega a imagem (Frame, PIL, array ou caminho) e o template
+            frame = as_frame(screenshot)
 
-            template = cv2.imread(template_path)
+            template = templates.get(template_path)
 
-            if img is None or template is None:
+            if frame is None or template is None:
                 print(f"❌ Erro ao carregar imagem ou template")
                 return {'found': False, 'matches': []}
 
-            # Converte pra escala de cinza
-            img_gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            template_gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
-
-            # Template matching
-            result = cv2.matchTemplate(img_gray, template_gray, cv2.TM_CCOEFF_NORMED)
+            # Busca grosso-fino no cinza do frame (em cache), na escala já medida
+            # para esta tela, sem duplicatas a menos de meia largura (matching.py)
+            found = match_template(frame, template, threshold)
 
-            # Encontra todos os matches acima do threshold
-            locations = np.where(result >= threshold)
-
-            if len(locations[0]) == 0:
+            if not found:
                 print(f"❌ Nenhum match encontrado")
                 return {'found': False, 'matches': []}
 
-            # Agrupa matches próximos (evita duplicatas)
-            h, w = template_gray.shape
+            # Centros já em coordenadas de tela, ordenados por confiança (maior primeiro)
             matches = []
-
-            for pt in zip(*locations[::-1]):
-                x, y = pt
-                confidence = result[y, x]
-
-                # Verifica se já existe um match muito próximo
-                is_duplicate = False
-                for existing_match in matches:
-                    distance = np.sqrt((x - existing_match['x'])**2 + (y - existing_match['y'])**2)
-                    if distance < w / 2:  # Se está muito perto, é duplicata
-                        is_duplicate = True
-                        break
-
-                if not is_duplicate:
-                    matches.append({
-                        'x': x + w // 2,  # Centro da bolinha
-                        'y': y + h // 2,
-                        'confidence': float(confidence)
-                    })
-
-            # Ordena por confiança (maior primeiro)
-            matches.sort(key=lambda m: m['confidence'], reverse=True)
+            for match in found:
+                center_x, center_y = frame.to_screen(match['x'] + match['width'] // 2,
+                                                     match['y'] + match['height'] // 2)  # Centro da bolinha
+                matches.append({
+                    'x': center_x,
+                    'y': center_y,
+                    'confidence': match['confidence']
+                })
 
             print(f"✓ Encontrados {len(matches)} matches")
             for i, match in enumerate(matches):
@@ -385,9 +456,36 @@ class ButtonLocator:
             return {'found': False, 'matches': []}
 
 
-    def read_report(self):
-        screenshot = self.capture_screen()
-        screenshot.save('temp_list.png')
+    def read_report(self, llm_fallback=True, relocate=False):
+        """
+        Lê EPM, MEP e SM do relatório aberto sem LLM (report_reader.py):
+        ancora nos rótulos e faz OCR só das células de valor.
+        Retorna um ReportRecord; o LLM só completa valores que o OCR não leu.
+        relocate=True procura os rótulos de novo em vez de usar os guardados.
+        """
+        record = report_reader.read(relocate=relocate)
+
+        if llm_fallback and not record.complete:
+            print(f"🤖 Valores não lidos pelo OCR: {record.missing()}, perguntando ao LLM...")
+            values = [parse_number(text) for text in self.read_report_llm()]
+
+            # Só vale resposta com exatamente 3 números na ordem pedida: com
+            # linha faltando ou sobrando os valores cairiam no campo errado.
+            # Negativo é o "não sei" (-1.0) do LLM
+            if len(values) != 3 or any(value is None for value in values):
+                print(f"⚠️  Resposta do LLM fora do formato, ignorada: {values}")
+                return record
+
+            for field, value in zip(('epm', 'mep', 'sm'), values):
+                if getattr(record, field) is None and value >= 0:
+                    setattr(record, field, value)
+                    record.confidences[field] = 0.0
+
+        return record
+
+    def read_report_llm(self):
+        """Leitura antiga do relatório pelo LLM: lista de textos (máximo, médio, percentual)"""
+        frame = self.capture_frame("relatorio")
 
         # LLM identifica quais itens estão abaixo
         #prompt = f"""Nesta imagem, procure os valores descrito nos outputs: 'Erro de ponto máximo' em mm, 'Media de erro de ponto' em mm e 
@@ -395,17 +493,7 @@ class ButtonLocator:
         #não tenha certeza de algum valor, retorne -1.0. Retorne apenas os números e nada mais"""
 
         prompt = """Me diga o valor máximo, Médio e percentual que você vê na tela. Retorne apenas os numeros e nada mais."""
-        response = ollama.chat(
-            model=self.llm_model,
-            messages=[{
-                'role': 'user',
-                'content': prompt,
-                'images': ['temp_list.png']
-            }]
-        )
-
-        items_text = response['message']['content'].strip()
-        items_list = [item.strip() for item in items_text.split('\n') if item.strip()]
+        items_list = self._ask_llm_for_items(frame, prompt)
 
         print(f"✓ LLM encontrou {len(items_list)} itens: {items_list}")
-        return items_list
\ No newline at end of file
+        return items_list
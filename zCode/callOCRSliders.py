@@ -2,27 +2,78 @@
 from tools.capture_module import PageCapture
 from template_matcher import TemplateMatcher
 from ocr_analyzer_for_sliders import OCRAnalyzer
-import os
+from viewport_stitch import stitch_viewports
 
-def callOCRSliders():
-    # Pega o diretório do script (zCode/)
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    # Sobe um nível para Elisa/ (raiz do projeto)
-    project_root = os.path.dirname(script_dir)
+# Print de onde cada recorte veio -> tecla que leva a tela até ele
+VIEWPORTS = {
+    'pre-template1.png': 'home',
+    'pre-template2.png': 'end'
+}
 
+
+def _picked_matches(results):
+    """Recorte de cada slider (regra do analyze_all_crops: com mais de 3, vale o primeiro e o último)"""
+    return [results[0], None, results[-1]] if len(results) > 3 else list(results)
+
+
+def _slider_fields(results, values):
+    """Associa cada valor lido ao recorte de onde veio (prints de Home e End separados)"""
+    fields = []
+    for value, match in zip(values, _picked_matches(results)):
+        if match is None:
+            fields.append(None)
+            continue
+        fields.append({
+            'value': value,
+            'screen_box': match['screen_box'],
+            'viewport': VIEWPORTS.get(match['screenshot'])
+        })
+    return fields
+
+
+def _panel_fields(panel, results, values):
+    """
+    Campos dos sliders achados no painel virtual: um por slider, de cima
+    pra baixo. As caixas do painel são convertidas para a tela (e para o
+    viewport onde aparecem) por panel.to_screen_box.
+    """
+    fields = []
+    for value, match in zip(values, _picked_matches(results)):
+        viewport, screen_box = (None, None) if match is None else panel.to_screen_box(*match['crop_box'])
+        fields.append(None if viewport is None else {
+            'value': value,
+            'screen_box': screen_box,
+            'viewport': viewport
+        })
+    return fields
+
+
+def read_slider_fields(save_debug=False):
+    """
+    Lê os valores atuais dos sliders e guarda onde cada um está.
+    Retorna (valores, campos); cada campo é {'value', 'screen_box' (x1, y1,
+    x2, y2 na tela), 'viewport' ('home' ou 'end')} ou None.
+
+    Os prints de Home e End são costurados num painel virtual
+    (viewport_stitch): cada slider aparece uma vez só e a identidade vem da
+    posição no diálogo. Se a costura falhar, busca nos dois prints separados.
+    Tudo roda em memória; save_debug=True grava os prints e recortes em ./salvos
+    """
     WIDTH_OFFSET = 50
     HEIGHT_OFFSET = 50
 
+    # Nomes em buttons/ (carregados uma vez pelo template_registry)
     TEMPLATES = {
-        'slidebar': os.path.join(project_root, 'buttons', 'input_slidebar.png'),
-        'slidebar_empty': os.path.join(project_root, 'buttons', 'input_slidebar_empty.png')
+        'slidebar': 'input_slidebar',
+        'slidebar_empty': 'input_slidebar_empty'
     }
 
     capturer = PageCapture(save_dir="./salvos")
-    capturer.clear_saved_images()
+    if save_debug:
+        capturer.clear_saved_images()
 
     capturer.click_to_activate()
-    screenshots = capturer.capture_initial_screenshots()
+    screenshots = capturer.capture_initial_screenshots(save=save_debug)
 
     matcher = TemplateMatcher(
         template_paths=TEMPLATES,
@@ -31,17 +82,31 @@ def callOCRSliders():
         offset_height=HEIGHT_OFFSET
     )
 
+    panel = stitch_viewports(*screenshots)
+    sources = [panel.frame] if panel is not None else screenshots
+
     total_found, results, crops = matcher.search_in_screenshots(
-        screenshots, 
-        save_dir="./salvos"
+        sources,
+        save_dir="./salvos" if save_debug else None
     )
 
     if total_found > 0:
         analyzer = OCRAnalyzer()
-        values = analyzer.analyze_all_crops(crops_dir="./salvos")
-        return values
+        values = analyzer.analyze_all_crops(crops)
+        if panel is not None:
+            return values, _panel_fields(panel, results, values)
+        return values, _slider_fields(results, values)
+
+    return [], []
+
 
-    return []
+def callOCRSliders(save_debug=False):
+    """
+    Lê os valores atuais dos sliders.
+    Tudo roda em memória; save_debug=True grava os prints e recortes em ./salvos
+    """
+    values, _ = read_slider_fields(save_debug)
+    return values
 
 if __name__ == "__main__":
     callOCRSliders()
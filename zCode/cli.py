@@ -0,0 +1,138 @@
+# cli.py
+"""
+Ponto de entrada por linha de comando (rodar de dentro de zCode/).
+
+Só os comandos de automação carregam a parte de visão (OpenCV, EasyOCR,
+pyautogui, PyQt5, ollama); consultar o banco ou pedir uma sugestão ao
+otimizador abre em menos de um segundo.
+
+    python cli.py run                         # automação completa (main.py)
+    python cli.py db [--projeto P] [--limite N]
+    python cli.py sugerir --projeto P --cluster Cluster_3
+    python cli.py imports [modulo]            # custo de import por módulo
+"""
+import argparse
+import subprocess
+import sys
+
+# Tempo máximo esperado de import para os comandos sem visão
+IMPORT_BUDGET = 1.0
+
+# Módulo importado por cada comando (usado pelo perfil de imports)
+COMMAND_MODULES = {
+    'run': 'main',
+    'db': 'database_manager',
+    'sugerir': 'target_optimizer'
+}
+
+
+def cmd_run(args):
+    from main import Main
+
+    Main(debug_screenshots=args.debug).main()
+
+
+def cmd_db(args):
+    from database_manager import DatabaseManager
+
+    db = DatabaseManager()
+    stats = db.get_statistics(args.projeto)
+    print("📊 Estatísticas:")
+    for key, value in stats.items():
+        if value is not None:
+            print(f"   {key}: {value}")
+
+    analyses = db.get_analyses_by_project(args.projeto) if args.projeto else db.get_all_analyses(args.limite)
+    print(f"\n🗂️  Últimas análises ({min(len(analyses), args.limite)}):")
+    for a in analyses[:args.limite]:
+        print(f"   #{a['id']} {a['data_hora']} {a['nome_projeto']} {a['cluster']} (análise {a['numero_analise']}): "
+              f"x1={a['input1_subamostra_nr']} x3={a['input3_subamostra_r']} -> "
+              f"EPM={a['output1_epm']} MEP={a['output2_mep']} SM={a['output3_sm']}")
+
+
+def cmd_sugerir(args):
+    from context import context
+    from target_optimizer import TargetOptimizer
+
+    context.set_project(args.projeto)
+    context.set_cluster(args.cluster)
+    context.set_static_inputs(args.x2, args.x4, args.x5)
+    context.set_minimum_dinamic_inputs(args.x1_min, args.x3_min)
+
+    x1, x2, x3 = TargetOptimizer().get_new_targets()
+    print(f"\n🎯 Sugestão para {args.cluster}: x1={x1}, x2={x2}, x3={x3}")
+
+
+def profile_imports(module):
+    """
+    Importa o módulo num processo novo com -X importtime e devolve
+    (total em segundos, [(segundos, pacote)]): o tempo próprio de cada
+    submódulo é somado no pacote de nível mais alto (numpy, cv2, skopt...).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        raise RuntimeError(lines[-1] if lines else "falha no import")
+
+    packages = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        own, _, name = line[len("import time:"):].split("|")
+        top = name.strip().split(".")[0]
+        packages[top] = packages.get(top, 0.0) + int(own) / 1e6
+
+    total = sum(packages.values())
+    return total, sorted(((seconds, name) for name, seconds in packages.items()), reverse=True)
+
+
+def cmd_imports(args):
+    module = COMMAND_MODULES.get(args.modulo, args.modulo)
+    total, packages = profile_imports(module)
+
+    print(f"⏱️  import {module}: {total:.2f}s")
+    for seconds, name in packages[:args.top]:
+        print(f"   {seconds * 1000:8.1f} ms  {name}")
+
+    if module != 'main':
+        status = "✓ dentro" if total <= IMPORT_BUDGET else "⚠️  acima"
+        print(f"{status} do orçamento de {IMPORT_BUDGET:.1f}s para comandos sem visão")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Automação de registro do SCENE")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="roda a automação completa")
+    run.add_argument("--debug", action="store_true", help="salva os frames de verificação em ./salvos")
+    run.set_defaults(func=cmd_run)
+
+    db = commands.add_parser("db", help="mostra o conteúdo do anp_analysis.db")
+    db.add_argument("--projeto", help="filtra por projeto")
+    db.add_argument("--limite", type=int, default=20, help="quantas análises listar")
+    db.set_defaults(func=cmd_db)
+
+    sugerir = commands.add_parser("sugerir", help="pede ao otimizador os próximos inputs")
+    sugerir.add_argument("--projeto", required=True)
+    sugerir.add_argument("--cluster", required=True)
+    sugerir.add_argument("--x2", type=float, default=.5)
+    sugerir.add_argument("--x4", type=float, default=10)
+    sugerir.add_argument("--x5", type=float, default=30)
+    sugerir.add_argument("--x1-min", type=float, default=.5)
+    sugerir.add_argument("--x3-min", type=float, default=.10)
+    sugerir.set_defaults(func=cmd_sugerir)
+
+    imports = commands.add_parser("imports", help="custo de import por módulo (python -X importtime)")
+    imports.add_argument("modulo", nargs="?", default="run", help="comando (run/db/sugerir) ou nome do módulo")
+    imports.add_argument("--top", type=int, default=15, help="quantos pacotes mostrar")
+    imports.set_defaults(func=cmd_imports)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# cluster_names.py
+import re
+
+# "Cluster_12" com as confusões comuns do OCR: l/I/| no lugar de 1, O/o no
+# lugar de 0, 5 no lugar de s e espaço/ponto/hífen no lugar do "_". Busca
+# (não match) com fronteiras de palavra: "[Cluster_3," ou "Cluster_12)" valem
+CLUSTER_REGEX = re.compile(
+    r'(?<![a-z0-9])c[l1i|]u[s5]ter\s*[_\-.\s]?\s*([0-9OoIl|]+)(?![a-z0-9])', re.IGNORECASE
+)
+CLUSTER_PREFIX = re.compile(r'^c[l1i|]u[s5]ter\s*[_\-.]?$', re.IGNORECASE)
+CLUSTER_NUMBER = re.compile(r'^[_\-.]?\s*([0-9OoIl|]+)$')
+DIGIT_FIXES = str.maketrans({'O': '0', 'o': '0', 'I': '1', 'l': '1', '|': '1'})
+
+# Qualquer palavra que pareça "cluster", mesmo mal lida: se alguma não virar
+# nome, a leitura ficou incompleta
+CLUSTER_STEM = re.compile(r'c[l1i|]u[s5]t|u[s5]ter', re.IGNORECASE)
+
+# Cabeçalhos/rótulos da árvore que mencionam clusters sem serem um
+CLUSTER_HEADER = re.compile(r'^c[l1i|]u[s5]ters$', re.IGNORECASE)
+
+# Pontuação que o OCR gruda nas bordas da palavra (sem '|', que pode ser um 1)
+EDGE_PUNCTUATION = ' \t,;:!?()[]{}<>"\'`'
+
+
+def _clean(text):
+    """Tira pontuação solta das bordas da palavra ('[Cluster_3,' -> 'Cluster_3')"""
+    return text.strip(EDGE_PUNCTUATION).rstrip('.')
+
+
+def parse_cluster_name(text):
+    """Texto do OCR -> nome canônico ('Cluster_12') ou None"""
+    match = CLUSTER_REGEX.search(_clean(text))
+    if not match:
+        return None
+    digits = match.group(1).translate(DIGIT_FIXES)
+    return f"Cluster_{digits}" if digits.isdigit() else None
+
+
+def _joined_words(words):
+    """
+    Palavras como vieram do OCR + pares "Cluster" / "12" que o OCR separou
+    (mesma linha, número logo à direita). Retorna (texto, palavra, índices
+    das palavras do OCR que formam o texto).
+    """
+    candidates = [(w['text'], w, (i,)) for i, w in enumerate(words)]
+
+    for p, prefix in enumerate(words):
+        if not CLUSTER_PREFIX.match(_clean(prefix['text'])):
+            continue
+        height = abs(prefix['bbox'][2][1] - prefix['bbox'][0][1]) or 10
+        right = prefix['bbox'][1][0]
+        same_line = [
+            (i, w) for i, w in enumerate(words)
+            if w is not prefix and CLUSTER_NUMBER.match(_clean(w['text']))
+            and abs(w['y'] - prefix['y']) < height / 2 and 0 <= w['bbox'][0][0] - right < 2 * height
+        ]
+        if same_line:
+            n, number = min(same_line, key=lambda item: item[1]['bbox'][0][0])
+            merged = {
+                'text': _clean(prefix['text']) + _clean(number['text']),
+                'x': (prefix['bbox'][0][0] + number['bbox'][1][0]) // 2,
+                'y': prefix['y'],
+                'bbox': [prefix['bbox'][0], number['bbox'][1], number['bbox'][2], prefix['bbox'][3]],
+                'confidence': min(prefix['confidence'], number['confidence'])
+            }
+            candidates.append((merged['text'], merged, (p, n)))
+
+    return candidates
+
+
+def scan_clusters(index, below=None):
+    """
+    Todos os clusters que o OCR leu no OCRIndex + o que ficou de fora.
+    below: palavra do índice (ex.: "Scans"); só conta o que estiver abaixo dela.
+    Nome repetido fica com a leitura mais confiável.
+
+    Retorna (clusters, perdidos): clusters é {nome: {'x', 'y', 'confidence'}}
+    em ordem vertical; perdidos são os textos que parecem "cluster" mas não
+    viraram nome (sinal de leitura incompleta).
+    """
+    clusters = {}
+    parsed = set()
+    for text, word, parts in _joined_words(index.words):
+        if below is not None and word['y'] <= below['y']:
+            continue
+        name = parse_cluster_name(text)
+        if name is None:
+            continue
+        parsed.update(parts)
+        if name not in clusters or word['confidence'] > clusters[name]['confidence']:
+            clusters[name] = {'x': int(word['x']), 'y': int(word['y']), 'confidence': word['confidence']}
+
+    missed = [
+        word['text'] for i, word in enumerate(index.words)
+        if i not in parsed and CLUSTER_STEM.search(word['text'])
+        and not CLUSTER_HEADER.match(_clean(word['text']))
+        and (below is None or word['y'] > below['y'])
+    ]
+    return dict(sorted(clusters.items(), key=lambda item: item[1]['y'])), missed
+
+
+def enumerate_clusters(index, below=None):
+    """Só os clusters de scan_clusters: {nome: {'x', 'y', 'confidence'}}"""
+    return scan_clusters(index, below)[0]
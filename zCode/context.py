@@ -1,5 +1,4 @@
 # context.py
-import pygetwindow as gw
 
 class AnalysisContext:
     def __init__(self):
@@ -18,6 +17,8 @@ class AnalysisContext:
 
     def set_project_from_window(self):
         """Extrai o nome do projeto do título da janela ativa"""
+        import pygetwindow as gw
+
         try:
             active_window = gw.getActiveWindow()
             if active_window:
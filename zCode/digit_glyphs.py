@@ -0,0 +1,184 @@
+# digit_glyphs.py
+import os
+import re
+import threading
+import cv2
+import numpy as np
+
+ATLAS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "digit_glyphs.npz")
+
+# Tamanho normalizado de cada glifo (largura, altura)
+GLYPH_SIZE = (10, 14)
+
+# Semelhança mínima de CADA glifo para aceitar a leitura sem EasyOCR
+MIN_SCORE = 0.85
+
+# Espaço entre palavras, em fração da altura da linha: o que vem depois dele
+# é a unidade ("0.010 m") e não entra na leitura
+WORD_GAP = 0.5
+
+# Amostras guardadas por caractere (fontes com antialiasing variam um pouco)
+MAX_SAMPLES_PER_CHAR = 6
+
+
+def _binarize(gray):
+    """Texto = 1, fundo = 0 (Otsu, qualquer que seja a cor do texto)"""
+    _, binary = cv2.threshold(gray, 0, 1, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    if binary.mean() > 0.5:
+        binary = 1 - binary
+    return binary
+
+
+def segment(gray):
+    """
+    Separa os caracteres do número na linha de texto mais baixa do rótulo.
+    A linha é cortada no primeiro espaço largo (WORD_GAP): a unidade depois
+    do número ("0.010 m") fica de fora.
+
+    Retorna lista (da esquerda para a direita) de (caractere_ou_None, glifo):
+    o ponto decimal é reconhecido pelo tamanho ('.'), os demais vêm como
+    None + glifo normalizado para comparar com o atlas.
+    """
+    binary = _binarize(gray)
+    count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    boxes = [tuple(stats[i, :4]) for i in range(1, count) if stats[i, cv2.CC_STAT_AREA] >= 2]
+    if not boxes:
+        return []
+
+    # Linha de referência: a do componente mais alto entre os que ficam mais embaixo
+    bottom = max(y + h for _, y, _, h in boxes)
+    line = [b for b in boxes if b[1] + b[3] >= bottom - 2]
+    line_top = min(y for _, y, _, _ in line)
+    line_height = bottom - line_top
+    boxes = [b for b in boxes if b[1] + b[3] > line_top and b[1] < bottom]
+
+    glyphs = []
+    right = None
+    for x, y, w, h in sorted(boxes):
+        if right is not None and x - right > WORD_GAP * line_height:
+            break
+        right = x + w if right is None else max(right, x + w)
+        if h < 0.4 * line_height and y + h >= bottom - 2:
+            glyphs.append(('.', None))
+            continue
+        glyph = binary[y:y + h, x:x + w].astype(np.float32)
+        normalized = cv2.resize(glyph, GLYPH_SIZE, interpolation=cv2.INTER_AREA)
+        glyphs.append((None, (normalized, w / h)))
+    return glyphs
+
+
+def _similarity(a, b):
+    """1 = glifos iguais; penaliza diferença de proporção (o '1' é estreito)"""
+    (image_a, aspect_a), (image_b, aspect_b) = a, b
+    return 1.0 - float(np.mean(np.abs(image_a - image_b))) - 0.5 * abs(aspect_a - aspect_b)
+
+
+class GlyphAtlas:
+    """
+    Reconhecedor clássico dos números dos sliders (sem rede neural).
+
+    A fonte da interface do SCENE é fixa e o alfabeto é só 0-9 e '.', então
+    cada caractere segmentado é comparado com amostras guardadas no atlas.
+    O atlas começa vazio e aprende sozinho com leituras confiáveis do
+    EasyOCR (learn), sendo salvo em digit_glyphs.npz.
+    """
+
+    def __init__(self, path=ATLAS_PATH):
+        self.path = path
+        self._samples = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._samples is None:
+            self._samples = {}
+            try:
+                data = np.load(self.path)
+                for char, image, aspect in zip(data['chars'], data['images'], data['aspects']):
+                    self._samples.setdefault(str(char), []).append((image, float(aspect)))
+            except (FileNotFoundError, OSError, KeyError, ValueError):
+                pass
+        return self._samples
+
+    def _save(self):
+        chars, images, aspects = [], [], []
+        for char, samples in self._samples.items():
+            for image, aspect in samples:
+                chars.append(char)
+                images.append(image)
+                aspects.append(aspect)
+        tmp_path = self.path + ".tmp.npz"
+        np.savez_compressed(tmp_path, chars=np.array(chars), images=np.array(images), aspects=np.array(aspects))
+        os.replace(tmp_path, self.path)
+
+    def _best(self, glyph):
+        """Caractere mais parecido com o glifo e a semelhança"""
+        best_char, best_score = None, -1.0
+        for char, samples in self._samples.items():
+            for sample in samples:
+                score = _similarity(glyph, sample)
+                if score > best_score:
+                    best_char, best_score = char, score
+        return best_char, best_score
+
+    def is_empty(self):
+        with self._lock:
+            return not self._load()
+
+    def recognize(self, gray):
+        """
+        Lê o rótulo (cinza). Retorna (texto, confiança) ou (None, 0.0) se
+        algum caractere não estiver no atlas com semelhança suficiente.
+        """
+        with self._lock:
+            if not self._load():
+                return None, 0.0
+
+            text, confidence = "", 1.0
+            for char, glyph in segment(gray):
+                if char is None:
+                    char, score = self._best(glyph)
+                    if score < MIN_SCORE:
+                        return None, 0.0
+                    confidence = min(confidence, score)
+                text += char
+
+        return (text, confidence) if any(c.isdigit() for c in text) else (None, 0.0)
+
+    def learn(self, gray, text):
+        """
+        Guarda os glifos de um rótulo cuja leitura (pelo EasyOCR) é confiável.
+        Só aprende se a segmentação bater caractere a caractere com o número
+        do texto (a unidade, "0.010 m" -> "0.010", não entra).
+        """
+        number = re.match(r'[0-9.]*', text.strip())
+        text = number.group() if number else ""
+        glyphs = segment(gray)
+        if not text:
+            return False
+        if len(glyphs) != len(text):
+            return False
+
+        changed = False
+        with self._lock:
+            samples = self._load()
+            if any((char == '.') != (expected == '.') for (char, _), expected in zip(glyphs, text)):
+                return False
+
+            for (char, glyph), expected in zip(glyphs, text):
+                if char is not None or not expected.isdigit():
+                    continue
+                known = samples.setdefault(expected, [])
+                if len(known) >= MAX_SAMPLES_PER_CHAR:
+                    continue
+                if any(_similarity(glyph, sample) >= 0.97 for sample in known):
+                    continue
+                known.append(glyph)
+                changed = True
+
+            if changed:
+                self._save()
+        return changed
+
+
+# Instância global única
+digit_glyphs = GlyphAtlas()
@@ -0,0 +1,72 @@
+# display_profile.py
+import json
+import os
+import threading
+import pyautogui
+
+PROFILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "display_profile.json")
+
+
+def display_key():
+    """Identifica a configuração de tela atual (resolução do monitor principal)"""
+    width, height = pyautogui.size()
+    return f"{width}x{height}"
+
+
+class DisplayProfile:
+    """
+    Guarda em disco informações medidas para uma configuração de tela
+    (escala dos templates, últimas posições dos botões, calibração dos
+    sliders...). Tudo fica separado por display_key(), então trocar de
+    monitor/resolução começa um perfil novo sem apagar o antigo.
+
+    Formato do arquivo: {display_key: {secao: {chave: valor}}}
+    """
+
+    def __init__(self, path=PROFILE_PATH):
+        self.path = path
+        self._data = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._data is None:
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    self._data = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._data = {}
+        return self._data
+
+    def _save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def get(self, section, key, default=None):
+        """Lê um valor do perfil da tela atual"""
+        with self._lock:
+            data = self._load()
+            return data.get(display_key(), {}).get(section, {}).get(key, default)
+
+    def set(self, section, key, value):
+        """Grava um valor no perfil da tela atual (persistido na hora)"""
+        with self._lock:
+            data = self._load()
+            data.setdefault(display_key(), {}).setdefault(section, {})[key] = value
+            self._save()
+
+    def clear(self, section=None):
+        """Apaga uma seção (ou o perfil inteiro) da tela atual"""
+        with self._lock:
+            data = self._load()
+            profile = data.get(display_key(), {})
+            if section is None:
+                profile.clear()
+            else:
+                profile.pop(section, None)
+            self._save()
+
+
+# Instância global única
+display_profile = DisplayProfile()
@@ -0,0 +1,156 @@
+# frame.py
+from pathlib import Path
+import cv2
+import numpy as np
+from PIL import ImageGrab
+from screen_regions import resolve_region
+
+
+class Frame:
+    """
+    Uma captura de tela mantida em memória, no formato BGR do OpenCV.
+
+    Todo o pipeline (captura → template matching → OCR) trabalha em cima
+    do array; recortes são views (sem cópia) e salvar em disco é opcional.
+
+    origin é a posição (x, y) do canto superior esquerdo do frame na tela,
+    usada para devolver coordenadas em espaço de tela quando a captura
+    foi limitada a uma região.
+
+    As conversões (cinza, pirâmide, views de regiões) são calculadas na
+    primeira vez que alguém pede e ficam guardadas: todas as buscas de uma
+    mesma iteração devem compartilhar o mesmo Frame.
+    """
+
+    def __init__(self, image, name="frame", origin=(0, 0)):
+        self.image = image
+        self.name = name
+        self.origin = origin
+        self._gray = None
+        self._pyramid = {}
+        self._views = {}
+        # Buscas (template, threshold) que já não acharam nada neste frame
+        self.absent = set()
+
+    @classmethod
+    def from_pil(cls, pil_image, name="frame", origin=(0, 0)):
+        """Cria o Frame a partir de uma imagem PIL (RGB)"""
+        rgb = np.asarray(pil_image.convert('RGB'))
+        return cls(cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR), name, origin)
+
+    @classmethod
+    def from_file(cls, path):
+        """Carrega o Frame de um arquivo (retorna None se não conseguir ler)"""
+        path = Path(path)
+        image = cv2.imread(str(path), cv2.IMREAD_COLOR)
+        if image is None:
+            return None
+        return cls(image, path.name)
+
+    @property
+    def bgr(self):
+        """Imagem BGR (formato nativo do Frame)"""
+        return self.image
+
+    @property
+    def gray(self):
+        """Imagem em escala de cinza (calculada uma vez)"""
+        if self._gray is None:
+            if self.image.ndim == 2:
+                self._gray = self.image
+            else:
+                self._gray = cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
+        return self._gray
+
+    def pyramid(self, level):
+        """Cinza reduzido por 2**level (cv2.pyrDown), com cache por nível"""
+        if level <= 0:
+            return self.gray
+        if level not in self._pyramid:
+            self._pyramid[level] = cv2.pyrDown(self.pyramid(level - 1))
+        return self._pyramid[level]
+
+    @property
+    def width(self):
+        return self.image.shape[1]
+
+    @property
+    def height(self):
+        return self.image.shape[0]
+
+    def crop(self, x1, y1, x2, y2):
+        """Recorte (view do array, sem cópia) limitado às bordas da imagem"""
+        x1 = max(0, int(x1))
+        y1 = max(0, int(y1))
+        x2 = min(self.width, int(x2))
+        y2 = min(self.height, int(y2))
+        return self.image[y1:y2, x1:x2]
+
+    def view(self, region):
+        """
+        Sub-Frame (view, sem cópia) de uma região, com cache.
+        region: (left, top, width, height) em coordenadas de TELA, 'scene' ou nome de painel.
+        O sub-Frame herda a origem correta, então os resultados continuam em espaço de tela.
+        """
+        key = region if isinstance(region, str) else tuple(int(v) for v in region)
+        if key not in self._views:
+            left, top, width, height = resolve_region(region)
+            x1 = max(0, left - self.origin[0])
+            y1 = max(0, top - self.origin[1])
+            x2 = min(self.width, left - self.origin[0] + width)
+            y2 = min(self.height, top - self.origin[1] + height)
+
+            sub = Frame(self.image[y1:y2, x1:x2], f"{self.name}[{key}]", self.to_screen(x1, y1))
+            if self._gray is not None:
+                # Reaproveita o cinza já calculado (também como view)
+                sub._gray = self._gray[y1:y2, x1:x2]
+            self._views[key] = sub
+        return self._views[key]
+
+    def to_screen(self, x, y):
+        """Converte coordenadas do frame para coordenadas da tela"""
+        return int(x) + self.origin[0], int(y) + self.origin[1]
+
+    def save(self, path):
+        """Salva o frame em disco (só para debug)"""
+        path = Path(path)
+        cv2.imwrite(str(path), self.image)
+        return path
+
+
+def dhash(gray, size=16):
+    """
+    Hash de diferença (dHash) de uma imagem em cinza: reduz para
+    (size+1) x size e compara pixels vizinhos. Retorna bytes; mudanças
+    estruturais na imagem mudam o hash, ruído mínimo não.
+    """
+    small = cv2.resize(gray, (size + 1, size), interpolation=cv2.INTER_AREA)
+    return np.packbits(small[:, 1:] > small[:, :-1]).tobytes()
+
+
+def capture_frame(name="frame", region=None):
+    """
+    Captura a tela direto para um Frame.
+    region: None (tela inteira), (left, top, width, height), 'scene' ou nome de painel
+    """
+    bounds = resolve_region(region)
+    if bounds is None:
+        return Frame.from_pil(ImageGrab.grab(), name)
+
+    left, top, width, height = bounds
+    image = ImageGrab.grab(bbox=(left, top, left + width, top + height))
+    return Frame.from_pil(image, name, origin=(left, top))
+
+
+def as_frame(source, name="frame"):
+    """
+    Normaliza qualquer entrada de imagem para Frame:
+    Frame, caminho (str/Path), array BGR ou imagem PIL.
+    """
+    if source is None or isinstance(source, Frame):
+        return source
+    if isinstance(source, (str, Path)):
+        return Frame.from_file(source)
+    if isinstance(source, np.ndarray):
+        return Frame(source, name)
+    return Frame.from_pil(source, name)
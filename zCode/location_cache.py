@@ -0,0 +1,53 @@
+# location_cache.py
+from display_profile import display_profile
+from simple.window_manager import get_scene_window_bounds
+
+
+class LocationCache:
+    """
+    Lembra onde cada template foi encontrado pela última vez.
+
+    Os botões do SCENE costumam aparecer sempre no mesmo lugar, então a
+    próxima busca tenta primeiro só uma janelinha em volta da última
+    posição e só cai para a busca completa se não encontrar.
+
+    As posições ficam no display_profile (separadas por resolução) e a
+    chave inclui a geometria da janela SCENE: mover ou redimensionar a
+    janela invalida as posições antigas automaticamente.
+    """
+
+    SECTION = 'posicoes'
+
+    def __init__(self, margin=40):
+        self.margin = margin
+
+    def _key(self, template):
+        bounds = get_scene_window_bounds()
+        geometry = ",".join(str(v) for v in bounds) if bounds else "sem_janela"
+        return f"{template.name}@{geometry}"
+
+    def search_region(self, template):
+        """Retângulo (left, top, width, height) em volta da última posição, ou None"""
+        last = display_profile.get(self.SECTION, self._key(template))
+        if last is None:
+            return None
+
+        scale = display_profile.get('escala', 'templates', 1.0)
+        half_w = int(template.width * scale / 2) + self.margin
+        half_h = int(template.height * scale / 2) + self.margin
+        return max(0, last['x'] - half_w), max(0, last['y'] - half_h), 2 * half_w, 2 * half_h
+
+    def remember(self, template, x, y):
+        """Guarda o centro (coordenadas de tela) do último acerto"""
+        key = self._key(template)
+        last = display_profile.get(self.SECTION, key)
+        if last is None or (last['x'], last['y']) != (int(x), int(y)):
+            display_profile.set(self.SECTION, key, {'x': int(x), 'y': int(y)})
+
+    def forget(self, template):
+        """Descarta a posição guardada (ex.: o botão mudou de lugar)"""
+        display_profile.set(self.SECTION, self._key(template), None)
+
+
+# Instância global única
+location_cache = LocationCache()
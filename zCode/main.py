@@ -1,22 +1,31 @@
 from button_locator import ButtonLocator
 from simple.window_manager import activate_and_maximize_scene_window
-import time
 import pyautogui
-import os
 from simple.moves import click, moverPara, enter, press
 from simple.notifications import notify
-import ollama
 from set_new_values_slidebar import adjust_sliders_to_target
-from status_window import StatusWindow  # <<< ADICIONAR
 from context import context
 from target_optimizer import TargetOptimizer
 from database_manager import DatabaseManager
+from screen_state import ScreenStateClassifier, ScreenState, BannerWaiter
+from waits import wait_for_stable_screen, wait_until
+from warmup import start_warmup
+import time
+
+
 
+LLM_MODEL = "gemma3:12b"
+
+# Telas em que o registro acabou (com ou sem sucesso)
+ESTADOS_FIM_REGISTRO = (ScreenState.FALHA_REGISTRO, ScreenState.RELATORIO, ScreenState.INICIAL)
 
 
 class Main:
-    def __init__(self):
+    def __init__(self, debug_screenshots=False):
         self.clusters_main_page = None
+        self.debug_screenshots = debug_screenshots
+        self.screen_state = ScreenStateClassifier()
+        self.banner_waiter = BannerWaiter(self.screen_state)
 
     def set_dropdown(self):
         moverPara(147,297)
@@ -24,53 +33,64 @@ class Main:
         press('down', 4)
         enter()
 
-    def processando(self):
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(script_dir)
-        template_path = os.path.join(project_root, "buttons", "registro_em_andamento.png")
-
-
-        locator = ButtonLocator()
-        screenshot = locator.capture_screen()
-
-        # Salva screenshot pra você ver o que ele tá capturando
-        screenshot.save("./salvos/debug_screenshot.png")
-        result = locator.find_with_template(screenshot, template_path)
-        if result['found']:
-            return True
-        else:
-            return False
-        
-
-    def verificar_falha_registro(self):
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(script_dir)
-        template_path = os.path.join(project_root, "buttons", "falha_no_registro.png")
-
-
-        locator = ButtonLocator()
-        screenshot = locator.capture_screen()
-
-        # Salva screenshot pra você ver o que ele tá capturando
-        screenshot.save("./salvos/debug_screenshot.png")
-        result = locator.find_with_template(screenshot, template_path)
-        if result['found']:
-            return True
-        else:
-            return False
-
+    def capture_poll_frame(self):
+        """Um único frame por iteração, compartilhado por todas as verificações"""
+        frame = self.screen_state.capture()
+
+        # Salva screenshot pra você ver o que ele tá capturando (só em modo debug)
+        if self.debug_screenshots:
+            frame.save("./salvos/debug_screenshot.png")
+        return frame
+
+    def aguardar_estado(self, estado, timeout=15.0):
+        """Espera a tela chegar num ScreenState (só o template dele, uma captura por verificação)"""
+        return wait_until(
+            lambda: self.screen_state.is_state(estado), timeout=timeout, poll=0.1, max_poll=0.5,
+            description=f"tela '{estado}'"
+        )
+
+    def aguardar_registro(self, registrar, max_cliques=3, timeout=1800, pronto_tolerancia=5.0):
+        """
+        Espera o registro terminar e retorna o ScreenState em que ele parou:
+        FALHA_REGISTRO, RELATORIO ou INICIAL (ou outro, se estourar o prazo).
+
+        Logo depois do clique o banner pode ainda não ter aparecido. Se a tela
+        continuar no diálogo (PRONTO_PARA_REGISTRAR) por mais que
+        pronto_tolerancia segundos, o clique não pegou: clica de novo em
+        'Registrar e verificar' (registrar = coordenadas do botão).
+        Estado desconhecido ou carregando: continua esperando.
+        """
+        deadline = time.monotonic() + timeout
+        cliques = 1
+        pronto_desde = None
+
+        while True:
+            estado = self.banner_waiter.wait_until_clear(self.capture_poll_frame(), timeout=timeout)
+            if estado in ESTADOS_FIM_REGISTRO or time.monotonic() >= deadline:
+                return estado
+
+            if estado == ScreenState.PRONTO_PARA_REGISTRAR:
+                pronto_desde = pronto_desde or time.monotonic()
+                if time.monotonic() - pronto_desde >= pronto_tolerancia:
+                    if cliques >= max_cliques:
+                        return estado
+                    print(f"🔁 O registro não começou, clicando de novo ({cliques + 1}/{max_cliques})...")
+                    moverPara(registrar['x'], registrar['y'])
+                    click()
+                    cliques += 1
+                    pronto_desde = None
+            else:
+                pronto_desde = None
 
+            time.sleep(0.5)
 
     def registroAutomatico(self):
+        from status_window import StatusWindow  # PyQt5 só quando a janela aparece
+
         status = StatusWindow()  # <<< ADICIONAR
         status.update("🚀 Iniciando automação...")  # <<< ADICIONAR
 
-        locator = ButtonLocator(llm_model="gemma3:12b")
-
-        # Pega o diretório do script (zCode/)
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        # Sobe um nível para ANP/ (raiz do projeto)
-        project_root = os.path.dirname(script_dir)
+        locator = ButtonLocator(llm_model=LLM_MODEL)
 
         try:
             #Essa variavel será usada so no final do loop
@@ -79,8 +99,7 @@ class Main:
             print(self.clusters_main_page)
 
             status.update("📍 Localizando botão 'Registro Automático'...")  # <<< ADICIONAR
-            template_path = os.path.join(project_root, "buttons", "registro_automatico.png")
-            use_template = template_path if os.path.exists(template_path) else None
+            use_template = "registro_automatico"
 
             result = locator.locate_tm(
                 button_name="",
@@ -89,7 +108,12 @@ class Main:
             )
             moverPara(result['x'], result['y'])
             click()
-            time.sleep(3)
+
+            # A lista de clusters só serve depois que a árvore com "Scans" aparecer
+            wait_until(
+                lambda: locator.ocr_index(region='arvore_scans').find("Scans", min_confidence=0.3, fuzzy_cutoff=0.8),
+                timeout=30, poll=0.5, max_poll=2.0, description="lista de 'Scans'"
+            )
         except:
             status.update("❌ Erro ao localizar botão inicial")  # <<< ADICIONAR
             notify("Ocorreu um erro inesperado", title="ANP", duration=1)
@@ -99,28 +123,30 @@ class Main:
 
 
     def main(self):
+        # OCR, skopt e modelo do Ollama carregam em paralelo com a ativação da janela
+        warmup = start_warmup(LLM_MODEL)
+
         # Ativa e maximiza a janela SCENE
         activate_and_maximize_scene_window()
-        time.sleep(1)
+        wait_for_stable_screen(timeout=2)
         context.set_project_from_window() # << SETA O NOME DO PROJETO
         context.set_static_inputs(.5, 10, 30)
         context.set_minimum_dinamic_inputs(.5, .10)
         
+        from status_window import StatusWindow  # PyQt5 só quando a janela aparece
+
         status = StatusWindow()  # <<< ADICIONAR
         status.update("🚀 Iniciando automação...")  # <<< ADICIONAR
 
-        locator = ButtonLocator(llm_model="gemma3:12b")
+        locator = ButtonLocator(llm_model=LLM_MODEL)
 
         target = TargetOptimizer()
 
         db = DatabaseManager()
 
+        print(f"🔥 Aquecimento: {warmup.summary()}")
 
 
-        # Pega o diretório do script (zCode/)
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        # Sobe um nível para ANP/ (raiz do projeto)
-        project_root = os.path.dirname(script_dir)
 
 
 
@@ -156,8 +182,7 @@ class Main:
                     # Clica em "Selecionar método"            
                     try:
                         status.update(f"⚙️ Configurando método para {nome}...")  # <<< ADICIONAR
-                        template_path = os.path.join(project_root, "buttons", "selecionar_metodo.png")
-                        use_template = template_path if os.path.exists(template_path) else None
+                        use_template = "selecionar_metodo"
 
                         success = locator.locate_tm(
                             button_name="Selecionar método",
@@ -169,9 +194,9 @@ class Main:
                             found_coords = locator.last_found_coords
                             moverPara(found_coords['x'], found_coords['y'])
                             click()
+                            self.aguardar_estado(ScreenState.PRONTO_PARA_REGISTRAR)
 
                             # ============ VERIFICAR E SELECIONAR DROPDOWN ============
-                            time.sleep(1)
                             self.set_dropdown()
 
                             # ============ AJUSTE DOS INPUTS ==============
@@ -183,8 +208,7 @@ class Main:
                             #============= CLICA PARA INICIAR O CICLO ==========
                             try:
                                 status.update(f"▶️ Iniciando registro de {nome}...")  # <<< ADICIONAR
-                                template_path = os.path.join(project_root, "buttons", "registrar_e_verificar.png")
-                                use_template = template_path if os.path.exists(template_path) else None
+                                use_template = "registrar_e_verificar"
 
                                 result = locator.locate_tm(
                                     button_name="",
@@ -197,20 +221,17 @@ class Main:
                             except:
                                 input("Error...")
                             ## ------- Aqui precisa de um sistema que espera o final do carregamento ---
-                            while True:
-                                if self.processando():
-                                    print(f"⏳ Aguardando fim do processamento...")
-                                    status.update(f"⏳ Aguardando fim do processamento...")
-                                    time.sleep(5)
-                                else:
-                                    break
+                            print(f"⏳ Aguardando fim do processamento...")
+                            status.update(f"⏳ Aguardando fim do processamento...")
+                            estado = self.aguardar_registro(locator.last_found_coords)
                             #Aqui podemos ter algumas paginas diferentes dependendo do resultado
                             #Precisamos fazer tratamento para todas as ocasiões
                             
 
                             #Pagina 1, falha no reigstro
-                            if self.verificar_falha_registro():
+                            if estado == ScreenState.FALHA_REGISTRO:
                                 status.update(f"⚠️ Parâmetros insuficientes. Incluindo na análise e tentando novamente...")
+                                sm = 0.0
                                 
                                 analysis_id, numero_analise = db.insert_analysis(
                                 nome_projeto=context.nome_projeto,
@@ -225,29 +246,42 @@ class Main:
                                 output3=float(0) # SM
                             )
                                 
-                                time.sleep(5)
+                                wait_for_stable_screen(timeout=5)
                                 moverPara(877,453) #Perigoso, mudar depois
                                 click()
-                            else:
+                            elif estado in (ScreenState.RELATORIO, ScreenState.INICIAL):
                                 #Pagina 2, clássica = inicial
-                                #Click no botao de resultado
+                                #Click no botao de resultado (se o relatório ainda não estiver aberto)
                                 status.update(f"✅ Finalizando {nome}...")  # <<< ADICIONAR
-                                time.sleep(2)
-                                print(self.clusters_main_page)
-                                y = self.clusters_main_page[nome]['y']
-                                moverPara(1136, y)
-                                click()
-                                time.sleep(1)
+                                if estado == ScreenState.INICIAL:
+                                    wait_for_stable_screen(timeout=3)
+                                    print(self.clusters_main_page)
+                                    y = self.clusters_main_page[nome]['y']
+                                    moverPara(1136, y)
+                                    click()
+                                    self.aguardar_estado(ScreenState.RELATORIO)
 
                             ###########
                             ########### Após Entrar no relatório ###############
                             ###########
-                                report_values = locator.read_report()
-                                
-                                ##SISTEMA DE ARMAZENAMENTO DAS VARIAVEIS
-                                ##PRÉ PRÉ TRATAMENTO
-                                outputs_limpos = [x.replace(' ', '').replace('%', '').replace('mm', '') for x in report_values]
+                                report = locator.read_report()
+                                if not report.complete:
+                                    # Nova captura, procurando os rótulos de novo
+                                    status.update(f"🔁 Relatório incompleto ({report.missing()}), relendo...")
+                                    report = locator.read_report(relocate=True)
+                                while not report.complete:
+                                    status.update(f"⚠️ Relatório incompleto: {report.missing()}")
+                                    resposta = input(f"Relatório incompleto ({report.missing()}). ENTER relê, 'p' grava sem saídas: ")
+                                    if resposta.strip().lower() == 'p':
+                                        break
+                                    report = locator.read_report(relocate=True)
+
+                                # Sem saídas (None) a linha fica fora do histórico do otimizador;
+                                # zeros entrariam nele como um resultado medido
+                                outputs = report.as_tuple() if report.complete else (None, None, None)
+                                sm = outputs[2]
 
+                                ##SISTEMA DE ARMAZENAMENTO DAS VARIAVEIS
                                 analysis_id, numero_analise = db.insert_analysis(
                                     nome_projeto=context.nome_projeto,
                                     cluster=context.cluster,
@@ -256,9 +290,9 @@ class Main:
                                     input3=targets[2],
                                     input4=context.static_inputs.get('x4'), # Opcional
                                     input5=context.static_inputs.get('x5'), # Opcional
-                                    output1=float(outputs_limpos[0]), # EPM
-                                    output2=float(outputs_limpos[1]), # MEP
-                                    output3=float(outputs_limpos[2]) # SM
+                                    output1=outputs[0], # EPM
+                                    output2=outputs[1], # MEP
+                                    output3=outputs[2] # SM
                                 )
                                 
                                 
@@ -268,8 +302,7 @@ class Main:
 
                                 ##FECHAR RELATÓRIO E REINICIAR LOOP
                                 status.update("📍 Fechando relatório...")  # <<< ADICIONAR
-                                template_path = os.path.join(project_root, "buttons", "fechar_relatorio.png")
-                                use_template = template_path if os.path.exists(template_path) else None
+                                use_template = "fechar_relatorio"
 
                                 result = locator.locate_tm(
                                     button_name="",
@@ -279,7 +312,12 @@ class Main:
                                 
                                 moverPara(result['x'], result['y'])
                                 click()
-                                time.sleep(1)
+                                self.aguardar_estado(ScreenState.INICIAL)
+                            else:
+                                # Registro não terminou numa tela conhecida: não clica às cegas
+                                status.update(f"❓ Registro de {nome} parou em '{estado}'")
+                                input(f"Registro de {nome} não terminou (tela: {estado}). Ajuste a tela e aperte ENTER para tentar de novo...")
+                                continue
                             self.registroAutomatico()
                             
                             
@@ -287,7 +325,7 @@ class Main:
                             # Análise Critério de parada #
                             ##############################
 
-                            if context.criterio <= float(outputs_limpos[2]):
+                            if sm is not None and context.criterio <= sm:
                                 break
                             else:
                                 pass
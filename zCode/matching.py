@@ -0,0 +1,220 @@
+# matching.py
+import cv2
+import numpy as np
+from display_profile import display_profile
+
+# Escalas testadas (nesta ordem) enquanto a escala da tela ainda não é conhecida
+SEARCH_SCALES = (1.0, 0.9, 1.1, 0.8, 1.25, 0.75, 1.5, 0.67, 2.0)
+
+# Confiança a partir da qual a busca por escala para na primeira que bater
+SCALE_ACCEPT_CONFIDENCE = 0.9
+
+
+def peak_points(result, threshold, min_distance):
+    """
+    Extrai os picos de um mapa de resposta do cv2.matchTemplate.
+
+    1. Filtro de máximo local (dilate 3x3): só sobram os pontos que são o
+       máximo da vizinhança, em vez de todos os pixels acima do threshold.
+    2. Supressão gulosa por distância, vetorizada: a cada passo fica o pico
+       mais forte e somem todos a menos de min_distance dele.
+
+    Retorna (xs, ys, scores) ordenados por confiança (maior primeiro).
+    """
+    dilated = cv2.dilate(result, np.ones((3, 3), np.uint8))
+    ys, xs = np.nonzero((result >= threshold) & (result >= dilated))
+    scores = result[ys, xs]
+
+    order = np.argsort(-scores, kind='stable')
+    xs, ys, scores = xs[order], ys[order], scores[order]
+
+    keep = []
+    remaining = np.arange(len(scores))
+    min_distance_sq = min_distance ** 2
+
+    while remaining.size:
+        best = remaining[0]
+        keep.append(best)
+        dist_sq = (xs[remaining] - xs[best]) ** 2 + (ys[remaining] - ys[best]) ** 2
+        remaining = remaining[dist_sq >= min_distance_sq]
+
+    keep = np.array(keep, dtype=int)
+    return xs[keep], ys[keep], scores[keep]
+
+
+def suppress_boxes(boxes, scores, overlap_threshold=0.7, min_center_distance=30):
+    """
+    Non-maximum suppression vetorizado para caixas (x1, y1, x2, y2).
+
+    Uma caixa é descartada se o centro dela estiver a menos de
+    min_center_distance de uma caixa mais forte, ou se a interseção
+    dividida pela MENOR das duas áreas passar de overlap_threshold.
+
+    Retorna os índices mantidos, ordenados por confiança (maior primeiro).
+    """
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+    scores = np.asarray(scores, dtype=float)
+    if len(scores) == 0:
+        return []
+
+    x1, y1, x2, y2 = boxes.T
+    areas = (x2 - x1) * (y2 - y1)
+    centers_x = (x1 + x2) / 2
+    centers_y = (y1 + y2) / 2
+
+    remaining = np.argsort(-scores, kind='stable')
+    keep = []
+
+    while remaining.size:
+        best = remaining[0]
+        keep.append(int(best))
+        rest = remaining[1:]
+
+        distance = np.hypot(centers_x[rest] - centers_x[best], centers_y[rest] - centers_y[best])
+
+        inter_w = np.minimum(x2[rest], x2[best]) - np.maximum(x1[rest], x1[best])
+        inter_h = np.minimum(y2[rest], y2[best]) - np.maximum(y1[rest], y1[best])
+        intersection = np.where((inter_w > 0) & (inter_h > 0), inter_w * inter_h, 0.0)
+        overlap = intersection / np.minimum(areas[rest], areas[best])
+
+        remaining = rest[(distance >= min_center_distance) & (overlap <= overlap_threshold)]
+
+    return keep
+
+
+def _match(image, template, mask=None):
+    """cv2.matchTemplate protegido contra template maior que a imagem"""
+    if image.shape[0] < template.shape[0] or image.shape[1] < template.shape[1]:
+        return None
+    return cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED, mask=mask)
+
+
+def _pyramid_level(width, height):
+    """Nível da busca grossa: o template reduzido precisa continuar com pelo menos 24px"""
+    level = 0
+    while level < 2 and min(width, height) >= 48 * 2 ** level:
+        level += 1
+    return level
+
+
+def match_pyramid(frame, template, threshold, scale=1.0, min_distance=None, max_candidates=20):
+    """
+    Template matching grosso-fino sobre o cinza do Frame.
+
+    Procura candidatos no nível reduzido da pirâmide (frame.pyramid) com um
+    threshold mais frouxo e só refina em resolução cheia numa janelinha em
+    volta de cada candidato. Templates pequenos demais para reduzir são
+    buscados direto em resolução cheia.
+
+    template: Template do template_registry; scale: escala aplicada ao template.
+    Retorna lista de matches {'x', 'y' (canto sup. esquerdo no frame), 'width',
+    'height', 'confidence', 'scale'} ordenada por confiança.
+    """
+    gray, mask = template.scaled(scale)
+    height, width = gray.shape
+    if min_distance is None:
+        min_distance = width / 2
+
+    level = _pyramid_level(width, height)
+
+    if level == 0:
+        result = _match(frame.gray, gray, mask)
+        if result is None:
+            return []
+        xs, ys, scores = peak_points(result, threshold, min_distance)
+        points = zip(xs.tolist(), ys.tolist(), scores.tolist())
+    else:
+        factor = 2 ** level
+        coarse_gray, coarse_mask = template.scaled(scale / factor)
+        coarse = _match(frame.pyramid(level), coarse_gray, coarse_mask)
+        if coarse is None:
+            return []
+
+        # No nível reduzido o texto borra e a correlação cai bastante: o threshold
+        # grosso é frouxo e só os max_candidates picos mais fortes são refinados
+        coarse_threshold = max(0.25, threshold - 0.35)
+        cxs, cys, _ = peak_points(coarse, coarse_threshold, max(1.0, min_distance / factor))
+
+        points = []
+        pad = 2 * factor
+        for cx, cy in zip(cxs[:max_candidates].tolist(), cys[:max_candidates].tolist()):
+            x1 = max(0, cx * factor - pad)
+            y1 = max(0, cy * factor - pad)
+            roi = frame.gray[y1:cy * factor + height + pad, x1:cx * factor + width + pad]
+            result = _match(roi, gray, mask)
+            if result is None:
+                continue
+            _, score, _, loc = cv2.minMaxLoc(result)
+            if score >= threshold:
+                points.append((x1 + loc[0], y1 + loc[1], score))
+
+    matches = [{
+        'x': int(x),
+        'y': int(y),
+        'width': width,
+        'height': height,
+        'confidence': float(score),
+        'scale': scale
+    } for x, y, score in points]
+
+    if len(matches) > 1:
+        boxes = [(m['x'], m['y'], m['x'] + width, m['y'] + height) for m in matches]
+        keep = suppress_boxes(boxes, [m['confidence'] for m in matches], min_center_distance=min_distance)
+        matches = [matches[i] for i in keep]
+
+    return matches
+
+
+def _search_scales(frame, template, threshold, min_distance):
+    """Testa SEARCH_SCALES e retorna os matches da melhor escala"""
+    best = []
+    for candidate in SEARCH_SCALES:
+        matches = match_pyramid(frame, template, threshold, candidate, min_distance)
+        if matches and (not best or matches[0]['confidence'] > best[0]['confidence']):
+            best = matches
+            if best[0]['confidence'] >= SCALE_ACCEPT_CONFIDENCE:
+                break
+    return best
+
+
+def match_template(frame, template, threshold=None, min_distance=None):
+    """
+    Template matching independente de resolução/DPI.
+
+    Com a escala dos templates já medida para esta tela (display_profile),
+    é UMA passada nessa escala: template ausente (o caso normal dos
+    templates de estado) custa só isso e retorna [].
+
+    Sem escala medida, testa SEARCH_SCALES e só guarda uma escala confirmada
+    com confiança >= SCALE_ACCEPT_CONFIDENCE, então um falso positivo fraco
+    não trava as buscas seguintes numa escala errada. Para medir de novo
+    (ex.: mudou o zoom do Windows), forget_scale().
+
+    Um template que não foi achado em nenhuma escala fica marcado no Frame:
+    procurar de novo no mesmo frame retorna [] sem refazer a busca.
+    """
+    threshold = template.threshold if threshold is None else threshold
+
+    scale = display_profile.get('escala', 'templates')
+    if scale is not None:
+        return match_pyramid(frame, template, threshold, scale, min_distance)
+
+    key = (template.name, threshold, min_distance)
+    if key in frame.absent:
+        return []
+
+    best = _search_scales(frame, template, threshold, min_distance)
+    if not best:
+        frame.absent.add(key)
+        return []
+
+    if best[0]['confidence'] >= SCALE_ACCEPT_CONFIDENCE:
+        print(f"📐 Escala dos templates nesta tela: {best[0]['scale']:.2f} (via '{template.name}')")
+        display_profile.set('escala', 'templates', best[0]['scale'])
+
+    return best
+
+
+def forget_scale():
+    """Descarta a escala medida: a próxima busca testa SEARCH_SCALES de novo"""
+    display_profile.clear('escala')
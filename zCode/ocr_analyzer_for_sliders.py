@@ -1,55 +1,135 @@
 # ocr_analyzer.py
-import easyocr
 from pathlib import Path
 import re
 import cv2
+from frame import Frame
+from matching import match_template
+from ocr_engines import engine_for
+from template_registry import templates
+
+# Só o que aparece nos valores dos sliders ("0.010 m"): sem o "m" e o espaço
+# o reconhecedor teria que decodificar a unidade como dígitos
+DIGITS_ALLOWLIST = '0123456789. m'
+
+# Margem em volta do rótulo do valor (acima da bolinha)
+LABEL_HALF_WIDTH = 40
+
+
+def track_ball(frame):
+    """
+    Bolinha do slider deste recorte: o recorte tem margem e pode pegar a
+    bolinha de um slider vizinho, então vale o match mais próximo da linha
+    da trilha (o meio do recorte), não o de maior confiança.
+    """
+    ball = templates.get('ball_input')
+    matches = match_template(frame, ball) if ball is not None else []
+    if not matches:
+        return None
+    track_y = frame.height / 2
+    return min(matches, key=lambda m: (abs(m['y'] + m['height'] / 2 - track_y), -m['confidence']))
+
 
 class OCRAnalyzer:
-    def __init__(self):
-        print("🔄 Carregando EasyOCR...")
-        self.reader = easyocr.Reader(['en'], gpu=True)
-        print("✓ EasyOCR carregado\n")
+    """
+    Leitura dos valores dos sliders.
 
-    def extract_slider_value(self, image_path):
-        """Extrai o valor numérico do slider"""
-        try:
-            # Carrega e AUMENTA a imagem 2x
-            img = cv2.imread(str(image_path))
-            img_large = cv2.resize(img, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+    Recorta o rótulo do valor (acima da bolinha) e lê todos os rótulos de
+    uma vez com o motor da tarefa 'slider_digits' (ocr_engines.py). O
+    padrão é o atlas de glifos com EasyOCR em lote para o que ele não
+    reconhecer; o benchmark chama este mesmo caminho.
+    engine: OCREngine a usar no lugar do configurado (ex.: benchmark).
+    """
+
+    def __init__(self, engine=None):
+        self.engine = engine
+        self.last_confidences = []
+        self.last_engines = []
+
+    @staticmethod
+    def _load(image):
+        """Recorte em memória ou caminho -> array BGR (None se não der pra ler)"""
+        return cv2.imread(str(image)) if isinstance(image, (str, Path)) else image
+
+    @staticmethod
+    def value_label(crop):
+        """
+        Caixa justa do número do slider dentro do recorte (cinza).
 
-            # Roda OCR na imagem aumentada
-            results = self.reader.readtext(img_large)
+        O recorte tem a trilha inteira com os rótulos de mínimo/máximo
+        embaixo; o valor atual fica logo acima da bolinha. Sem bolinha,
+        usa a faixa acima do meio do recorte.
+        """
+        frame = Frame(crop, name="recorte_slider")
+        best = track_ball(frame)
 
-            # Procura apenas por números
-            for (bbox, text, confidence) in results:
-                numbers = re.findall(r'\d+\.?\d*', text)
-                if numbers:
-                    return float(numbers[0])
+        if best is not None:
+            center_x = best['x'] + best['width'] // 2
+            x1 = max(0, center_x - LABEL_HALF_WIDTH)
+            label = frame.gray[:best['y'], x1:center_x + LABEL_HALF_WIDTH]
+        else:
+            label = frame.gray[:frame.height // 2]
 
-            return "N/A"
+        return label if label.size else frame.gray
+
+    @staticmethod
+    def parse_value(text):
+        """Texto reconhecido -> float do primeiro número (a unidade é ignorada) ou None"""
+        numbers = re.findall(r'\d+(?:\.\d+)?', text)
+        return float(numbers[0]) if numbers else None
+
+    def read_values(self, images):
+        """
+        Lê vários sliders de uma vez (recortes em memória ou caminhos).
+        Retorna uma lista de floats (None onde não deu pra ler), na ordem.
+        """
+        labels = []
+        for image in images:
+            img = self._load(image)
+            labels.append(None if img is None else self.value_label(img))
+
+        reads = [(None, 0.0)] * len(labels)
+        self.last_engines = [None] * len(labels)
+
+        engine = self.engine or engine_for('slider_digits')
+        present = [i for i, label in enumerate(labels) if label is not None]
+        try:
+            engine_reads = engine.read_lines([labels[i] for i in present], DIGITS_ALLOWLIST)
         except Exception as e:
-            return "ERROR"
+            print(f"⚠️  Erro no OCR dos sliders: {e}")
+            engine_reads = []
+
+        sources = getattr(engine, 'last_sources', None) or [engine.name] * len(present)
+        for i, read, source in zip(present, engine_reads, sources):
+            reads[i] = read
+            self.last_engines[i] = source
+
+        self.last_confidences = [confidence for _, confidence in reads]
+        return [self.parse_value(text) if text else None for text, _ in reads]
+
+    def extract_slider_value(self, image):
+        """Extrai o valor numérico do slider (recorte em memória ou caminho); None se não ler"""
+        return self.read_values([image])[0]
 
     def _extract_number_from_filename(self, filename):
         """Extrai o número do nome do arquivo pos-templateX.png"""
         match = re.search(r'pos-template(\d+)', filename.stem)
         return int(match.group(1)) if match else 0
 
-    def analyze_all_crops(self, crops_dir="./salvos"):
-        """Analisa todos os recortes pos-template"""
-        crops_dir = Path(crops_dir)
-        crop_files = list(crops_dir.glob("pos-template*.png"))
+    def analyze_all_crops(self, crops=None, crops_dir="./salvos"):
+        """
+        Analisa todos os recortes dos sliders (um lote só de OCR).
+        crops: lista de recortes em memória (arrays BGR), na ordem dos sliders.
+        Sem crops, lê os arquivos pos-template*.png de crops_dir (modo antigo).
+        """
+        if crops is None:
+            crop_files = list(Path(crops_dir).glob("pos-template*.png"))
+            crops = sorted(crop_files, key=self._extract_number_from_filename)
 
-        if not crop_files:
+        if not crops:
             print("❌ Nenhum recorte encontrado")
             return []
 
-        crop_files = sorted(crop_files, key=self._extract_number_from_filename)
-        values = []
-
-        for crop_file in crop_files:
-            value = self.extract_slider_value(crop_file)
-            values.append(value)
+        values = self.read_values(crops)
 
         # Se tiver mais de 3 valores, pega primeiro e último
         if len(values) > 3:
@@ -0,0 +1,318 @@
+# ocr_engines.py
+import os
+import threading
+import cv2
+import numpy as np
+from display_profile import display_profile
+from ocr_readers import get_reader
+
+# Tarefas de OCR da automação (cada uma pode usar um motor diferente):
+#   slider_digits  valores dos sliders (OCRAnalyzer)
+#   cluster_names  lista de clusters (ButtonLocator.list_clusters / list_items_below)
+#   button_text    texto de botões e rótulos da tela (ButtonLocator.find_text_with_ocr...)
+#   report_labels  rótulos do relatório (ReportReader.locate_labels)
+#   report_values  células de valor do relatório (ReportReader.read_values)
+OCR_TASKS = ('slider_digits', 'cluster_names', 'button_text', 'report_labels', 'report_values')
+
+# Como cada tarefa lê: 'linha' = read_lines em recortes justos, 'texto' = read na imagem toda
+TASK_KINDS = {
+    'slider_digits': 'linha',
+    'cluster_names': 'texto',
+    'button_text': 'texto',
+    'report_labels': 'texto',
+    'report_values': 'linha'
+}
+
+# Idiomas do EasyOCR por tarefa: números só precisam do modelo em inglês (menor)
+TASK_LANGUAGES = {
+    'slider_digits': ('en',),
+    'report_values': ('en',)
+}
+
+# Motor de cada tarefa enquanto o benchmark (tools/ocr_benchmark.py) não escolher outro
+DEFAULT_ENGINES = {
+    'slider_digits': 'glifos',
+    'cluster_names': 'easyocr',
+    'button_text': 'easyocr',
+    'report_labels': 'easyocr',
+    'report_values': 'easyocr'
+}
+
+# Margem em volta de cada recorte no lote do EasyOCR
+BATCH_PADDING = 8
+
+# Leituras do fallback a partir desta confiança ensinam o atlas de glifos
+LEARN_CONFIDENCE = 0.9
+
+# Executável do Tesseract (no Windows normalmente não está no PATH)
+TESSERACT_CMD = os.environ.get('TESSERACT_CMD')
+
+
+class OCREngine:
+    """
+    Interface comum dos motores de OCR.
+
+    read(image): texto livre na imagem inteira, no formato do EasyOCR
+        readtext: lista de (bbox com 4 pontos, texto, confiança 0-1)
+    read_line(image, allowlist): imagem já justa em volta de UMA linha
+        (ex.: número de um slider); retorna (texto, confiança) ou (None, 0.0)
+    read_lines(images, allowlist): várias linhas de uma vez (é o que a
+        automação e o benchmark chamam); por padrão, uma read_line por imagem
+
+    kinds: quais dos dois o motor implementa ('texto', 'linha')
+    for_task(task): instância configurada para a tarefa (ex.: idiomas)
+    """
+
+    name = None
+    kinds = ('texto', 'linha')
+
+    @classmethod
+    def for_task(cls, task):
+        return cls()
+
+    def available(self):
+        """O motor pode ser usado nesta máquina (dependências instaladas)"""
+        return True
+
+    @classmethod
+    def supports(cls, task):
+        """O motor sabe fazer o tipo de leitura da tarefa"""
+        return TASK_KINDS[task] in cls.kinds
+
+    def read(self, image):
+        raise NotImplementedError(f"{self.name} não lê texto livre")
+
+    def read_line(self, image, allowlist=None):
+        raise NotImplementedError(f"{self.name} não lê linhas")
+
+    def read_lines(self, images, allowlist=None):
+        return [self.read_line(image, allowlist) for image in images]
+
+
+class EasyOCREngine(OCREngine):
+    """EasyOCR pelo registro compartilhado (ocr_readers.py, com cache)"""
+
+    name = 'easyocr'
+
+    def __init__(self, languages=('pt', 'en'), gpu=True):
+        self.languages = languages
+        self.gpu = gpu
+
+    @classmethod
+    def for_task(cls, task):
+        return cls(TASK_LANGUAGES.get(task, ('pt', 'en')))
+
+    @property
+    def reader(self):
+        return get_reader(self.languages, self.gpu)
+
+    def available(self):
+        try:
+            import easyocr  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def read(self, image):
+        return self.reader.readtext(image)
+
+    def read_line(self, image, allowlist=None):
+        height, width = image.shape[:2]
+        results = self.reader.recognize(
+            image, horizontal_list=[[0, width, 0, height]], free_list=[], allowlist=allowlist, detail=1
+        )
+        if not results:
+            return None, 0.0
+        _, text, confidence = results[0]
+        return text, float(confidence)
+
+    def read_lines(self, images, allowlist=None):
+        """
+        Lê várias linhas numa chamada só do EasyOCR.
+
+        Sem detector: os recortes são empilhados numa imagem e cada caixa vai
+        direto para o reconhecimento (recognize). A margem é da cor do fundo:
+        replicar a borda espalharia um glifo cortado no canto.
+        """
+        if not images:
+            return []
+        images = [cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image for image in images]
+        width = max(image.shape[1] for image in images) + 2 * BATCH_PADDING
+        rows, boxes, top = [], [], 0
+        for image in images:
+            padded = cv2.copyMakeBorder(
+                image, BATCH_PADDING, BATCH_PADDING, BATCH_PADDING, width - image.shape[1] - BATCH_PADDING,
+                cv2.BORDER_CONSTANT, value=int(np.median(image))
+            )
+            rows.append(padded)
+            boxes.append([0, width, top, top + padded.shape[0]])
+            top += padded.shape[0]
+
+        reads = [(None, 0.0)] * len(images)
+        results = self.reader.recognize(
+            np.vstack(rows), horizontal_list=boxes, free_list=[], allowlist=allowlist,
+            batch_size=len(boxes), detail=1
+        )
+
+        # Cada resultado volta com a caixa: a linha dele no lote diz de qual recorte veio
+        for bbox, text, confidence in results:
+            y_center = (bbox[0][1] + bbox[2][1]) / 2
+            row = next((i for i, (_, _, y1, y2) in enumerate(boxes) if y1 <= y_center < y2), None)
+            if row is not None:
+                reads[row] = (text, float(confidence))
+        return reads
+
+
+class TesseractEngine(OCREngine):
+    """Tesseract via pytesseract (opcional: só importa quando usado)"""
+
+    name = 'tesseract'
+
+    def __init__(self, lang='por+eng', cmd=TESSERACT_CMD):
+        self.lang = lang
+        self.cmd = cmd
+
+    def _pytesseract(self):
+        import pytesseract
+        if self.cmd:
+            pytesseract.pytesseract.tesseract_cmd = self.cmd
+        return pytesseract
+
+    def available(self):
+        try:
+            self._pytesseract().get_tesseract_version()
+        except Exception:
+            return False
+        return True
+
+    @staticmethod
+    def _rgb(image):
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB) if image.ndim == 3 else image
+
+    def read(self, image):
+        pytesseract = self._pytesseract()
+        data = pytesseract.image_to_data(
+            self._rgb(image), lang=self.lang, output_type=pytesseract.Output.DICT
+        )
+        results = []
+        for i, text in enumerate(data['text']):
+            confidence = float(data['conf'][i])
+            if not text.strip() or confidence < 0:
+                continue
+            x, y, w, h = data['left'][i], data['top'][i], data['width'][i], data['height'][i]
+            bbox = [[x, y], [x + w, y], [x + w, y + h], [x, y + h]]
+            results.append((bbox, text, confidence / 100))
+        return results
+
+    def read_line(self, image, allowlist=None):
+        pytesseract = self._pytesseract()
+        config = '--psm 7'
+        if allowlist:
+            config += f' -c tessedit_char_whitelist={allowlist}'
+        data = pytesseract.image_to_data(
+            self._rgb(image), lang=self.lang, config=config, output_type=pytesseract.Output.DICT
+        )
+        words = [(t, float(c)) for t, c in zip(data['text'], data['conf']) if t.strip() and float(c) >= 0]
+        if not words:
+            return None, 0.0
+        text = "".join(t for t, _ in words)
+        return text, min(c for _, c in words) / 100
+
+
+class GlyphEngine(OCREngine):
+    """
+    Atlas de glifos dos sliders (digit_glyphs.py), em milissegundos na CPU.
+
+    O que o atlas não reconhece vai para o EasyOCR em lote, e as leituras
+    confiáveis do fallback ensinam o atlas para as próximas vezes. Só serve
+    para os sliders: o atlas é da fonte deles. last_sources diz quem leu
+    cada linha na última chamada ('glifos' ou 'easyocr').
+    """
+
+    name = 'glifos'
+    kinds = ('linha',)
+
+    def __init__(self, fallback=None):
+        self.fallback = fallback or EasyOCREngine(TASK_LANGUAGES['slider_digits'])
+        self.last_sources = []
+
+    @classmethod
+    def supports(cls, task):
+        return task == 'slider_digits'
+
+    @staticmethod
+    def _gray(image):
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+
+    def read_line(self, image, allowlist=None):
+        return self.read_lines([image], allowlist)[0]
+
+    def read_lines(self, images, allowlist=None):
+        from digit_glyphs import digit_glyphs
+
+        grays = [self._gray(image) for image in images]
+        reads = [digit_glyphs.recognize(gray) for gray in grays]
+        self.last_sources = ['glifos' if text else None for text, _ in reads]
+
+        pending = [i for i, (text, _) in enumerate(reads) if not text]
+        if pending:
+            fallback_reads = self.fallback.read_lines([grays[i] for i in pending], allowlist)
+            for i, (text, confidence) in zip(pending, fallback_reads):
+                reads[i] = (text, confidence)
+                self.last_sources[i] = self.fallback.name
+                if text and confidence >= LEARN_CONFIDENCE:
+                    digit_glyphs.learn(grays[i], text)
+        return reads
+
+
+ENGINES = {
+    'easyocr': EasyOCREngine,
+    'tesseract': TesseractEngine,
+    'glifos': GlyphEngine
+}
+
+
+class OCREngineConfig:
+    """
+    Qual motor usar em cada tarefa. A escolha do benchmark fica no
+    display_profile (seção 'ocr_engines'): o tamanho da fonte na tela
+    muda qual motor acerta mais.
+    """
+
+    SECTION = 'ocr_engines'
+
+    def __init__(self):
+        self._instances = {}
+        self._lock = threading.Lock()
+
+    def engine_name(self, task):
+        """Nome do motor configurado para a tarefa (o padrão, se o salvo não servir)"""
+        name = display_profile.get(self.SECTION, task, DEFAULT_ENGINES[task])
+        if name not in ENGINES or not ENGINES[name].supports(task):
+            return DEFAULT_ENGINES[task]
+        return name
+
+    def set_engine(self, task, name):
+        """Troca o motor de uma tarefa (persistido)"""
+        if name not in ENGINES:
+            raise ValueError(f"Motor de OCR desconhecido: {name}")
+        if not ENGINES[name].supports(task):
+            raise ValueError(f"Motor de OCR {name} não faz leitura de '{TASK_KINDS[task]}' ({task})")
+        display_profile.set(self.SECTION, task, name)
+
+    def engine_for(self, task):
+        """Instância (reaproveitada) do motor da tarefa, configurada para ela"""
+        key = (self.engine_name(task), task)
+        with self._lock:
+            if key not in self._instances:
+                self._instances[key] = ENGINES[key[0]].for_task(task)
+            return self._instances[key]
+
+
+# Instância global única
+ocr_engines = OCREngineConfig()
+
+
+def engine_for(task):
+    """Atalho para ocr_engines.engine_for()"""
+    return ocr_engines.engine_for(task)
@@ -0,0 +1,94 @@
+# ocr_index.py
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from frame import as_frame
+
+
+def normalize_text(text):
+    """Minúsculas, sem acentos e sem espaços sobrando (para comparar textos do OCR)"""
+    text = unicodedata.normalize('NFKD', text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(text.lower().split())
+
+
+class OCRIndex:
+    """
+    Tudo o que o OCR leu num frame, para várias consultas com UMA leitura.
+
+    Cada palavra é um dict {'text', 'x', 'y' (centro, tela), 'bbox' (tela),
+    'confidence'}. Consultas: exact (dicionário pelo texto normalizado),
+    contains, fuzzy (difflib) e regex. Todas aceitam min_confidence e
+    devolvem as palavras da mais confiável para a menos confiável.
+    """
+
+    def __init__(self, words):
+        self.words = sorted(words, key=lambda w: -w['confidence'])
+        self._by_text = {}
+        for word in self.words:
+            self._by_text.setdefault(normalize_text(word['text']), []).append(word)
+
+    @classmethod
+    def from_results(cls, frame, results):
+        """Monta o índice a partir do retorno do readtext sobre o frame"""
+        words = []
+        for bbox, text, confidence in results:
+            x_coords = [point[0] for point in bbox]
+            y_coords = [point[1] for point in bbox]
+            center_x, center_y = frame.to_screen(sum(x_coords) / 4, sum(y_coords) / 4)
+            words.append({
+                'text': text,
+                'x': int(center_x),
+                'y': int(center_y),
+                'bbox': [frame.to_screen(px, py) for px, py in bbox],
+                'confidence': float(confidence)
+            })
+        return cls(words)
+
+    @classmethod
+    def build(cls, screenshot, engine):
+        """Uma passada de OCR no frame inteiro (engine: OCREngine de ocr_engines.py)"""
+        frame = as_frame(screenshot)
+        return cls.from_results(frame, engine.read(frame.image))
+
+    def __len__(self):
+        return len(self.words)
+
+    def exact(self, text, min_confidence=0.0):
+        """Palavras cujo texto é exatamente text (ignorando caixa/acentos)"""
+        return [w for w in self._by_text.get(normalize_text(text), []) if w['confidence'] >= min_confidence]
+
+    def contains(self, text, min_confidence=0.0):
+        """Palavras que contêm text"""
+        needle = normalize_text(text)
+        return [w for w in self.words
+                if w['confidence'] >= min_confidence and needle in normalize_text(w['text'])]
+
+    def fuzzy(self, text, cutoff=0.8, min_confidence=0.0):
+        """Palavras parecidas com text (razão do difflib >= cutoff), mais parecidas primeiro"""
+        needle = normalize_text(text)
+        scored = []
+        for word in self.words:
+            if word['confidence'] < min_confidence:
+                continue
+            ratio = SequenceMatcher(None, needle, normalize_text(word['text'])).ratio()
+            if ratio >= cutoff:
+                scored.append((ratio, word))
+        scored.sort(key=lambda item: (-item[0], -item[1]['confidence']))
+        return [word for _, word in scored]
+
+    def regex(self, pattern, min_confidence=0.0, flags=re.IGNORECASE):
+        """Palavras em que o padrão aparece (re.search)"""
+        compiled = re.compile(pattern, flags)
+        return [w for w in self.words if w['confidence'] >= min_confidence and compiled.search(w['text'])]
+
+    def find(self, text, min_confidence=0.0, fuzzy_cutoff=None):
+        """Melhor palavra para text: exata, senão contendo, senão (opcional) parecida; None se nada"""
+        for candidates in (self.exact(text, min_confidence), self.contains(text, min_confidence)):
+            if candidates:
+                return candidates[0]
+        if fuzzy_cutoff is not None:
+            candidates = self.fuzzy(text, fuzzy_cutoff, min_confidence)
+            if candidates:
+                return candidates[0]
+        return None
@@ -0,0 +1,175 @@
+# ocr_readers.py
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Quantas leituras ficam guardadas no cache (somando todos os leitores)
+OCR_CACHE_SIZE = 256
+
+
+class OCRCache:
+    """
+    LRU limitado de resultados de OCR.
+
+    Chave: hash exato dos pixels da imagem (formato + bytes) + método +
+    configuração do leitor + argumentos. Hash exato de propósito: para os
+    valores dos sliders, um dígito diferente muda poucos pixels e um hash
+    perceptual poderia devolver o número errado.
+
+    enabled=False faz toda leitura ir ao leitor (ex.: benchmark de latência).
+    """
+
+    def __init__(self, maxsize=OCR_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(config, method, image, kwargs):
+        """Chave do cache ou None se a entrada não for um array (caminho, bytes...)"""
+        if not isinstance(image, np.ndarray):
+            return None
+        digest = hashlib.blake2b(np.ascontiguousarray(image).data, digest_size=16)
+        digest.update(repr((image.shape, str(image.dtype))).encode())
+        return config, method, digest.hexdigest(), repr(sorted(kwargs.items()))
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        """Contadores para acompanhar a eficácia do cache"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class CachedReader:
+    """
+    Leitor EasyOCR com cache na frente de readtext e recognize.
+    O resto (atributos e métodos) vai direto para o leitor original.
+    """
+
+    CACHED_METHODS = ('readtext', 'recognize')
+
+    def __init__(self, reader, config, cache):
+        self.reader = reader
+        self.config = config
+        self.cache = cache
+
+    def _cached_call(self, method, image, *args, **kwargs):
+        if args or not self.cache.enabled:
+            return getattr(self.reader, method)(image, *args, **kwargs)
+
+        key = self.cache.make_key(self.config, method, image, kwargs)
+        if key is not None:
+            result = self.cache.get(key)
+            if result is not None:
+                return list(result)
+
+        result = getattr(self.reader, method)(image, *args, **kwargs)
+        if key is not None:
+            self.cache.put(key, list(result))
+        return result
+
+    def readtext(self, image, *args, **kwargs):
+        return self._cached_call('readtext', image, *args, **kwargs)
+
+    def recognize(self, image, *args, **kwargs):
+        return self._cached_call('recognize', image, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.reader, name)
+
+
+class OCRReaderRegistry:
+    """
+    Registro único (por processo) de leitores EasyOCR.
+    Cada leitor é criado na primeira vez que é pedido e reaproveitado depois,
+    chaveado pelo conjunto de idiomas e pelo dispositivo (GPU/CPU).
+    Todos passam pelo mesmo OCRCache: regiões com pixels idênticos não
+    são lidas de novo.
+    """
+
+    def __init__(self):
+        self._readers = {}
+        self._lock = threading.Lock()
+        self.cache = OCRCache()
+
+    @staticmethod
+    def _make_key(languages, gpu):
+        return (tuple(sorted(languages)), bool(gpu))
+
+    def get(self, languages=('pt', 'en'), gpu=True):
+        """Retorna o leitor para (idiomas, dispositivo), carregando só na primeira vez"""
+        key = self._make_key(languages, gpu)
+
+        reader = self._readers.get(key)
+        if reader is not None:
+            return reader
+
+        with self._lock:
+            # Outra thread pode ter carregado enquanto esperávamos o lock
+            reader = self._readers.get(key)
+            if reader is None:
+                import easyocr
+
+                print(f"🔄 Carregando EasyOCR {list(key[0])} ({'GPU' if key[1] else 'CPU'})...")
+                reader = CachedReader(easyocr.Reader(list(languages), gpu=gpu), key, self.cache)
+                self._readers[key] = reader
+                print("✓ EasyOCR carregado")
+
+        return reader
+
+    def is_loaded(self, languages=('pt', 'en'), gpu=True):
+        """Verifica se o leitor já foi carregado"""
+        return self._make_key(languages, gpu) in self._readers
+
+    def clear(self):
+        """Descarta todos os leitores carregados (e o cache de leituras)"""
+        with self._lock:
+            self._readers.clear()
+        self.cache.clear()
+
+
+# Instância global única
+ocr_readers = OCRReaderRegistry()
+
+
+def get_reader(languages=('pt', 'en'), gpu=True):
+    """Atalho para ocr_readers.get()"""
+    return ocr_readers.get(languages, gpu)
+
+
+def ocr_cache_stats():
+    """Atalho para ocr_readers.cache.stats()"""
+    return ocr_readers.cache.stats()
@@ -0,0 +1,155 @@
+# report_reader.py
+import re
+from frame import as_frame, capture_frame
+from display_profile import display_profile
+from ocr_engines import engine_for
+from ocr_index import OCRIndex
+
+# Rótulos do relatório do SCENE -> campo. A palavra-âncora serve quando o
+# OCR quebra o rótulo em várias palavras
+REPORT_LABELS = {
+    'epm': ('Erro de ponto máximo', 'máximo'),
+    'mep': ('Média de erro de ponto', 'média'),
+    'sm': ('Sobreposição mínima', 'sobreposição'),
+}
+
+VALUE_ALLOWLIST = '0123456789.,%m '
+
+# Tarefas de OCR (ocr_engines.py): rótulos são texto livre, valores são linhas
+LABEL_TASK = 'report_labels'
+VALUE_TASK = 'report_values'
+
+
+def parse_number(text):
+    """'1,7 mm' / '25.0%' / '-1.0' -> float (ou None)"""
+    numbers = re.findall(r'-?\d+(?:[.,]\d+)?', text or "")
+    return float(numbers[0].replace(',', '.')) if numbers else None
+
+
+class ReportRecord:
+    """Valores do relatório: epm (mm), mep (mm), sm (%) e a confiança de cada um"""
+
+    def __init__(self, epm=None, mep=None, sm=None, confidences=None):
+        self.epm = epm
+        self.mep = mep
+        self.sm = sm
+        self.confidences = confidences or {}
+
+    @property
+    def complete(self):
+        return all(v is not None for v in (self.epm, self.mep, self.sm))
+
+    def missing(self):
+        return [field for field in REPORT_LABELS if getattr(self, field) is None]
+
+    def as_tuple(self):
+        return self.epm, self.mep, self.sm
+
+    def __repr__(self):
+        parts = [f"{field}={getattr(self, field)} ({self.confidences.get(field, 0.0):.2f})" for field in REPORT_LABELS]
+        return f"ReportRecord({', '.join(parts)})"
+
+
+class ReportReader:
+    """
+    Lê o relatório sem LLM.
+
+    Na primeira vez (por resolução) faz uma passada de OCR de texto livre
+    (motor de LABEL_TASK) no painel do relatório só para achar os três
+    rótulos e guarda onde eles ficam (display_profile, seção 'relatorio').
+    Daí em diante lê só a célula de valor à direita de cada rótulo, com o
+    motor de VALUE_TASK.
+    """
+
+    SECTION = 'relatorio'
+
+    def __init__(self, region='relatorio'):
+        self.region = region
+
+    @staticmethod
+    def _label_box(index, label, anchor):
+        """Caixa (x1, y1, x2, y2, frame) do rótulo inteiro no índice, ou None"""
+        word = index.find(label, min_confidence=0.2, fuzzy_cutoff=0.75)
+        if word is None:
+            word = index.find(anchor, min_confidence=0.2)
+        if word is None:
+            return None
+
+        x1, y1 = word['bbox'][0]
+        x2, y2 = word['bbox'][2]
+        # O rótulo pode ter vindo quebrado: estende até a última palavra com letras da mesma linha
+        height = y2 - y1
+        for other in index.words:
+            ox1, oy1 = other['bbox'][0]
+            ox2, _ = other['bbox'][2]
+            same_line = abs(other['y'] - word['y']) < height / 2
+            if same_line and ox1 >= x2 and ox1 - x2 < 2 * height and re.search(r'[^\W\d_]', other['text']):
+                x2 = max(x2, ox2)
+        return int(x1), int(y1), int(x2), int(y2)
+
+    def locate_labels(self, frame):
+        """Acha os rótulos com uma passada de OCR e guarda a posição (relativa ao frame)"""
+        index = OCRIndex.build(frame, engine_for(LABEL_TASK))
+        labels = {}
+        for field, (label, anchor) in REPORT_LABELS.items():
+            box = self._label_box(index, label, anchor)
+            if box is not None:
+                x1, y1, x2, y2 = box
+                labels[field] = [x1 - frame.origin[0], y1 - frame.origin[1], x2 - frame.origin[0], y2 - frame.origin[1]]
+
+        if len(labels) == len(REPORT_LABELS):
+            display_profile.set(self.SECTION, 'rotulos', labels)
+        else:
+            print(f"⚠️  Rótulos do relatório não encontrados: {[f for f in REPORT_LABELS if f not in labels]}")
+        return labels
+
+    def _value_cells(self, frame, box):
+        """Células candidatas ao valor de um rótulo: à direita na mesma linha, depois logo abaixo"""
+        x1, y1, x2, y2 = box
+        height = y2 - y1
+        pad = max(2, height // 4)
+        yield frame.crop(x2 + pad, y1 - pad, min(frame.width, x2 + 12 * height), y2 + pad)
+        yield frame.crop(x1 - pad, y2, x2 + pad, y2 + int(1.6 * height))
+
+    @staticmethod
+    def read_cell(cell, engine=None):
+        """OCR de uma célula de valor -> (número ou None, confiança)"""
+        engine = engine or engine_for(VALUE_TASK)
+        text, confidence = engine.read_line(cell, VALUE_ALLOWLIST)
+        return parse_number(text), confidence
+
+    def read_values(self, frame, labels):
+        """OCR só das células de valor; retorna ReportRecord"""
+        record = ReportRecord()
+        for field, box in labels.items():
+            for cell in self._value_cells(frame, box):
+                if cell.size == 0:
+                    continue
+                value, confidence = self.read_cell(cell)
+                if value is not None:
+                    setattr(record, field, value)
+                    record.confidences[field] = confidence
+                    break
+        return record
+
+    def read(self, frame=None, relocate=False):
+        """
+        Lê EPM, MEP e SM do relatório aberto (frame: captura já feita, opcional).
+        relocate=True ignora os rótulos guardados e procura de novo.
+        """
+        frame = as_frame(frame) if frame is not None else capture_frame(name="relatorio", region=self.region)
+
+        labels = None if relocate else display_profile.get(self.SECTION, 'rotulos')
+        record = self.read_values(frame, labels) if labels else None
+
+        if record is None or not record.complete:
+            # Layout novo (ou mudou): acha os rótulos de novo e relê
+            labels = self.locate_labels(frame)
+            record = self.read_values(frame, labels)
+
+        print(f"📄 Relatório: {record}")
+        return record
+
+
+# Instância global única
+report_reader = ReportReader()
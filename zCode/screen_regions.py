@@ -0,0 +1,53 @@
+# screen_regions.py
+import pyautogui
+from simple.window_manager import get_scene_window_bounds
+
+# Painéis conhecidos do SCENE, em frações da janela (x, y, largura, altura).
+# Medidos com a janela maximizada em 1920x1080; como são relativos, acompanham
+# outras resoluções. Se o layout mudar, basta ajustar aqui.
+PANELS = {
+    'scene':               (0.00, 0.00, 1.00, 1.00),
+    'arvore_scans':        (0.00, 0.05, 0.30, 0.90),  # árvore de Scans/Clusters (esquerda)
+    'painel_registro':     (0.45, 0.05, 0.55, 0.90),  # diálogo de registro com os sliders
+    'banner_processamento': (0.20, 0.25, 0.60, 0.50),  # aviso "registro em andamento"
+    'relatorio':           (0.15, 0.10, 0.70, 0.80),  # relatório com EPM/MEP/SM
+}
+
+
+def screen_bounds():
+    """Retângulo da tela inteira (left, top, width, height)"""
+    width, height = pyautogui.size()
+    return 0, 0, width, height
+
+
+def resolve_region(region):
+    """
+    Converte uma região em retângulo absoluto (left, top, width, height).
+
+    region pode ser:
+        None                      → tela inteira (retorna None)
+        (left, top, width, height) → usado como está
+        'scene'                   → limites da janela SCENE
+        nome de PANELS            → painel relativo à janela SCENE
+    Sem janela SCENE aberta, os painéis são calculados sobre a tela inteira.
+    """
+    if region is None:
+        return None
+
+    if not isinstance(region, str):
+        left, top, width, height = (int(v) for v in region)
+        return left, top, width, height
+
+    if region not in PANELS:
+        raise ValueError(f"Região desconhecida: '{region}'. Opções: {list(PANELS)}")
+
+    base = get_scene_window_bounds() or screen_bounds()
+    base_left, base_top, base_width, base_height = base
+    fx, fy, fw, fh = PANELS[region]
+
+    return (
+        base_left + int(fx * base_width),
+        base_top + int(fy * base_height),
+        int(fw * base_width),
+        int(fh * base_height),
+    )
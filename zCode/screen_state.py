@@ -0,0 +1,163 @@
+# screen_state.py
+import time
+from frame import as_frame, capture_frame, dhash
+from matching import match_template
+from template_registry import templates
+
+
+class ScreenState:
+    """Estados da interface do SCENE que a automação sabe reconhecer"""
+    PROCESSANDO = 'processando'                      # banner "registro em andamento"
+    FALHA_REGISTRO = 'falha_registro'                # diálogo de falha no registro
+    RELATORIO = 'relatorio'                          # relatório aberto (botão fechar)
+    PRONTO_PARA_REGISTRAR = 'pronto_para_registrar'  # diálogo com "Registrar e verificar"
+    CARREGANDO = 'carregando'
+    INICIAL = 'inicial'                              # página com "Registro Automático"
+    DESCONHECIDO = 'desconhecido'
+
+
+# (estado, template em buttons/) — a ordem é a prioridade: o primeiro que
+# aparecer na tela define o estado
+STATE_TEMPLATES = [
+    (ScreenState.PROCESSANDO, 'registro_em_andamento'),
+    (ScreenState.FALHA_REGISTRO, 'falha_no_registro'),
+    (ScreenState.RELATORIO, 'fechar_relatorio'),
+    (ScreenState.PRONTO_PARA_REGISTRAR, 'registrar_e_verificar'),
+    (ScreenState.CARREGANDO, 'loading'),
+    (ScreenState.INICIAL, 'registro_automatico'),
+]
+
+
+class ScreenStateClassifier:
+    """
+    Reconhece em que tela o SCENE está com UMA captura.
+
+    Todos os templates de STATE_TEMPLATES são avaliados no mesmo Frame
+    (cinza e pirâmide calculados uma vez só), cada um apenas na região
+    esperada pelo manifest.json.
+    """
+
+    def __init__(self, state_templates=STATE_TEMPLATES, region='scene'):
+        self.state_templates = [(state, templates.get(name)) for state, name in state_templates]
+        self.state_templates = [(state, t) for state, t in self.state_templates if t is not None]
+        self.region = region
+        self.last_state = None
+        self.last_matches = {}
+
+    def capture(self):
+        """Captura o frame usado numa verificação"""
+        return capture_frame(name="estado", region=self.region)
+
+    def locate(self, frame, template):
+        """Procura um template na região dele dentro do frame; retorna centro (tela), tamanho e confiança"""
+        view = frame.view(template.region) if template.region else frame
+        matches = match_template(view, template)
+        if not matches:
+            return None
+        best = matches[0]
+        x, y = view.to_screen(best['x'] + best['width'] // 2, best['y'] + best['height'] // 2)
+        return {'x': x, 'y': y, 'width': best['width'], 'height': best['height'], 'confidence': best['confidence']}
+
+    def template_for(self, state):
+        """Template usado para reconhecer um estado (ou None)"""
+        for candidate, template in self.state_templates:
+            if candidate == state:
+                return template
+        return None
+
+    def evaluate(self, frame=None):
+        """Avalia TODOS os templates no frame e retorna {estado: match ou None}"""
+        frame = as_frame(frame) if frame is not None else self.capture()
+        self.last_matches = {state: self.locate(frame, template) for state, template in self.state_templates}
+        return self.last_matches
+
+    def classify(self, frame=None):
+        """
+        Retorna o estado atual (ScreenState.*). Os templates são avaliados em
+        ordem de prioridade e a busca para no primeiro encontrado.
+        """
+        frame = as_frame(frame) if frame is not None else self.capture()
+        self.last_matches = {}
+        self.last_state = ScreenState.DESCONHECIDO
+
+        for state, template in self.state_templates:
+            match = self.locate(frame, template)
+            self.last_matches[state] = match
+            if match is not None:
+                self.last_state = state
+                break
+
+        return self.last_state
+
+    def is_state(self, state, frame=None):
+        """Verifica só o template de um estado"""
+        frame = as_frame(frame) if frame is not None else self.capture()
+        template = self.template_for(state)
+        return template is not None and self.locate(frame, template) is not None
+
+
+class BannerWaiter:
+    """
+    Espera um banner (por padrão o "registro em andamento") sumir sem ficar
+    refazendo template matching na tela inteira.
+
+    Acha o banner uma vez, passa a observar só o retângulo dele em alta
+    frequência comparando um dHash minúsculo, e só roda o template matching
+    (apenas naquele recorte) quando o hash muda. A cada recheck_every
+    segundos o recorte é verificado mesmo sem mudança, por segurança.
+    """
+
+    def __init__(self, classifier, state=ScreenState.PROCESSANDO, poll=0.1, margin=10, recheck_every=30.0):
+        self.classifier = classifier
+        self.state = state
+        self.poll = poll
+        self.margin = margin
+        self.recheck_every = recheck_every
+
+    def _banner_region(self, match):
+        half_w = match['width'] // 2 + self.margin
+        half_h = match['height'] // 2 + self.margin
+        return max(0, match['x'] - half_w), max(0, match['y'] - half_h), 2 * half_w, 2 * half_h
+
+    def _watch(self, template, region, deadline):
+        """Observa o retângulo até o banner sumir (True) ou o prazo acabar (False)"""
+        last_hash = dhash(capture_frame(name="banner", region=region).gray)
+        last_check = time.monotonic()
+
+        while deadline is None or time.monotonic() < deadline:
+            time.sleep(self.poll)
+            small = capture_frame(name="banner", region=region)
+            current_hash = dhash(small.gray)
+
+            now = time.monotonic()
+            if current_hash != last_hash or now - last_check >= self.recheck_every:
+                last_hash = current_hash
+                last_check = now
+                if not match_template(small, template):
+                    return True
+
+        return False
+
+    def wait_until_clear(self, frame=None, timeout=None):
+        """
+        Bloqueia enquanto o banner estiver na tela e retorna o ScreenState
+        seguinte (classificado com um frame novo). Se o prazo acabar,
+        retorna o próprio estado do banner.
+        """
+        template = self.classifier.template_for(self.state)
+        if template is None:
+            return self.classifier.classify(frame)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        frame = as_frame(frame) if frame is not None else self.classifier.capture()
+
+        while True:
+            match = self.classifier.locate(frame, template)
+            if match is None:
+                return self.classifier.classify(frame)
+
+            if not self._watch(template, self._banner_region(match), deadline):
+                return self.state
+
+            # O recorte mudou: confirma na tela toda (o banner pode só ter mudado de lugar)
+            frame = self.classifier.capture()
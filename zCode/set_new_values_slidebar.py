@@ -1,188 +1,274 @@
-import os
 import time
 import pyautogui
 from button_locator import ButtonLocator
 from simple.moves import click, moverPara
 from simple.notifications import notify
-from callOCRSliders import callOCRSliders
+from callOCRSliders import read_slider_fields
+from ocr_analyzer_for_sliders import OCRAnalyzer, track_ball
+from frame import capture_frame
+from matching import match_template
+from template_registry import templates
+from slider_planner import SLIDER_SPECS, is_plausible, plan_keys, plan_cost, send_plan, describe_plan
+from slider_calibration import slider_calibration
+from waits import act_and_wait, wait_for_stable_screen
 
 # Passos de cada slider
-SLIDER_STEPS = [0.005, 0.05, 0.001]  # input1, input2, input3
+SLIDER_STEPS = [spec.step for spec in SLIDER_SPECS]  # input1, input2, input3
 
-def adjust_sliders_to_target(target_values):
+BALL_TEMPLATE = 'ball_input'
+
+
+def _field_region(field):
+    """screen_box (x1, y1, x2, y2) -> região (left, top, width, height)"""
+    x1, y1, x2, y2 = field['screen_box']
+    return x1, y1, x2 - x1, y2 - y1
+
+
+def find_ball_in_field(field):
+    """Procura a bolinha do slider no recorte dele (a mais perto da trilha); retorna centro (tela) e tamanho ou None"""
+    frame = capture_frame(name="campo_slider", region=_field_region(field))
+    best = track_ball(frame)
+    if best is None:
+        return None
+    x, y = frame.to_screen(best['x'] + best['width'] // 2, best['y'] + best['height'] // 2)
+    return {'x': x, 'y': y, 'width': best['width'], 'height': best['height']}
+
+
+def read_field_value(field):
+    """Um OCR só do recorte do slider"""
+    frame = capture_frame(name="campo_slider", region=_field_region(field))
+    return OCRAnalyzer().extract_slider_value(frame.bgr)
+
+
+def adjust_slider(slider_idx, ball, current, target, spec=None):
     """
-    Ajusta os sliders pros valores desejados
-    target_values: lista com 3 valores [input1, input2, input3]
+    Leva um slider de current a target: clica na bolinha e manda a
+    sequência de teclas mais curta (slider_planner) em rajadas.
+    ball=None: o slider já está com foco (ex.: logo depois de arrastar)
+    spec: SliderSpec a usar (ex.: com os limites calibrados)
     """
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-    template_path = os.path.join(project_root, 'buttons', 'ball_input.png')
-
-    if not os.path.exists(template_path):
-        print(f"❌ Template não encontrado: {template_path}")
+    if current is None:
         return
 
-    locator = ButtonLocator()
+    spec = spec or SLIDER_SPECS[slider_idx]
+    if not is_plausible(current, target, spec):
+        print(f"   ⚠️  Um possível erro foi identificado no slider {slider_idx + 1} (lido {current}, alvo {target})")
+        return
 
-    # Pega valores atuais
-    current_values = callOCRSliders()
+    plan = plan_keys(current, target, spec)
 
-    if len(current_values) != 3 or len(target_values) != 3:
-        print("❌ Erro: precisa de exatamente 3 valores")
+    if not plan:
+        print(f"\n✓ Slider {slider_idx + 1}: já está no valor correto ({current})")
         return
 
-    print(f"\n🎯 Ajustando sliders:")
-    print(f"   Atual: {current_values}")
-    print(f"   Alvo:  {target_values}")
-
-    # Clica no canto superior esquerdo pra ativar
-    print("\n🖱️ Ativando janela...")
-    #pyautogui.click(1182, 743)
-    time.sleep(0.3)
-
-    # ===== SLIDERS 1 e 2 (após Home) =====
-    print("\n🏠 Apertando Home...")
-    pyautogui.press('home')
-    time.sleep(1)
-
-    # Procura bolinhas 1 e 2
-    screenshot = locator.capture_screen()
-    screenshot.save('temp_adjust_sliders.png')
-    result = locator.find_all_with_template('temp_adjust_sliders.png', template_path, threshold=0.7)
-
-    if result['found'] and len(result['matches']) >= 2:
-        # SLIDER 1 (primeira bolinha após Home)
-        slider_idx = 0
-        current = current_values[slider_idx]
-        target = target_values[slider_idx]
-        step = SLIDER_STEPS[slider_idx]
-
-        if current != "N/A" and current != "ERROR":
-            diff = target - current
-            steps_needed = int(round(diff / step))
-
-            if steps_needed != 0:
-                direction = 'right' if steps_needed > 0 else 'left'
-                steps_abs = abs(steps_needed)
-
-                print(f"\n🔧 Slider 1: {current} → {target}")
-                print(f"   Precisa: {steps_abs} passos pra {direction}")
-
-                ball = result['matches'][0]  # Primeira bolinha
-                print(f"   🔵 Clicando em ({ball['x']}, {ball['y']})")
-                notify(f"Ajustando slider 1", title="Elisa", duration=2)
-                moverPara(ball['x'], ball['y'])
-                click()
-                time.sleep(0.3)
-
-                print(f"   ⌨️  Pressionando '{direction}' {steps_abs}x...")
-                if steps_abs > 1000:
-                    print("Um possivel erro foi identificado em um dos sliders...")
-                    pass
-                else:
-                    for _ in range(steps_abs):
-                        pyautogui.press(direction)
-                        time.sleep(0.05)
-                time.sleep(0.5)
-            else:
-                print(f"\n✓ Slider 1: já está no valor correto ({current})")
-
-        # SLIDER 2 (segunda bolinha após Home)
-        slider_idx = 1
-        current = current_values[slider_idx]
-        target = target_values[slider_idx]
-        step = SLIDER_STEPS[slider_idx]
-
-        if current != "N/A" and current != "ERROR":
-            diff = target - current
-            steps_needed = int(round(diff / step))
-
-            if steps_needed != 0:
-                direction = 'right' if steps_needed > 0 else 'left'
-                steps_abs = abs(steps_needed)
-
-                print(f"\n🔧 Slider 2: {current} → {target}")
-                print(f"   Precisa: {steps_abs} passos pra {direction}")
-
-                ball = result['matches'][1]  # Segunda bolinha
-                print(f"   🔵 Clicando em ({ball['x']}, {ball['y']})")
-                notify(f"Ajustando slider 2", title="Elisa", duration=2)
-                moverPara(ball['x'], ball['y'])
-                click()
-                time.sleep(0.3)
-
-                print(f"   ⌨️  Pressionando '{direction}' {steps_abs}x...")
-                if steps_abs > 1000:
-                    print("Um possivel erro foi identificado em um dos sliders...")
-                    pass
-                else:
-                    for _ in range(steps_abs):
-                        pyautogui.press(direction)
-                        time.sleep(0.05)
-                    time.sleep(0.5)
-            else:
-                print(f"\n✓ Slider 2: já está no valor correto ({current})")
-    else:
-        print("   ❌ Bolinhas 1 e 2 não encontradas após Home")
-
-    # ===== SLIDER 3 (após End) =====
-    print("\n📜 Apertando End...")
-    moverPara(1182, 297) #here
-    click()
-    pyautogui.press('end')
-    time.sleep(1)
-
-    # Procura bolinha 3
-    screenshot = locator.capture_screen()
-    screenshot.save('temp_adjust_sliders.png')
-    result = locator.find_all_with_template('temp_adjust_sliders.png', template_path, threshold=0.7)
-
-    if result['found'] and len(result['matches']) > 0:
-        slider_idx = 2
-        current = current_values[slider_idx]
-        target = target_values[slider_idx]
-        step = SLIDER_STEPS[slider_idx]
-
-        if current != "N/A" and current != "ERROR":
-            diff = target - current
-            steps_needed = int(round(diff / step))
-
-            if steps_needed != 0:
-                direction = 'right' if steps_needed > 0 else 'left'
-                steps_abs = abs(steps_needed)
-
-                print(f"\n🔧 Slider 3: {current} → {target}")
-                print(f"   Precisa: {steps_abs} passos pra {direction}")
-
-                ball = result['matches'][0]  # Primeira (e única) bolinha
-                print(f"   🔵 Clicando em ({ball['x']}, {ball['y']})")
-                notify(f"Ajustando slider 3", title="Elisa", duration=2)
-                moverPara(ball['x'], ball['y'])
-                click()
-                time.sleep(0.3)
-
-                print(f"   ⌨️  Pressionando '{direction}' {steps_abs}x...")
-                
-                if steps_abs > 1000:
-                    print("Um possivel erro foi identificado em um dos sliders...")
-                    pass
+    print(f"\n🔧 Slider {slider_idx + 1}: {current} → {target}")
+    print(f"   Plano: {describe_plan(plan)} ({plan_cost(plan)} teclas)")
+
+    if ball is not None:
+        print(f"   🔵 Clicando em ({ball['x']}, {ball['y']})")
+        notify(f"Ajustando slider {slider_idx + 1}", title="Elisa", duration=2)
+        moverPara(ball['x'], ball['y'])
+        act_and_wait(click, timeout=1, change_timeout=0.3)
+
+    send_plan(plan)
+    wait_for_stable_screen(timeout=2)
+
+
+class SliderController:
+    """
+    Ajuste em malha fechada dos 3 sliders.
+
+    Lê todos os sliders UMA vez (read_slider_fields) e guarda o recorte de
+    cada um. Depois de mexer num slider, relê só o recorte dele e tenta de
+    novo até bater com o alvo (no máximo max_attempts vezes). Os sliders
+    que já estão no valor certo não são tocados nem relidos.
+
+    Tentativas, em ordem: arrastar a
+    bolinha até o pixel do alvo com a geometria calibrada (calibrate; mede
+    na primeira vez) e, por fim, teclas planejadas a partir do valor lido.
+    """
+
+    def __init__(self, calibrate=True, max_attempts=3):
+        self.calibrate = calibrate
+        self.max_attempts = max_attempts
+        self.specs = [slider_calibration.spec_with_bounds(spec) for spec in SLIDER_SPECS]
+        self.locator = ButtonLocator()
+        self.values = []
+        self.fields = []
+
+    def read(self):
+        """Leitura completa (Home + End + OCR de todos os recortes)"""
+        self.values, self.fields = read_slider_fields()
+        return self.values
+
+    def _scroll(self, viewport):
+        """Leva a tela para o trecho do diálogo onde os recortes foram tirados"""
+        if viewport == 'home':
+            print("\n🏠 Apertando Home...")
+        else:
+            print("\n📜 Apertando End...")
+            moverPara(1182, 297) #here
+            click()
+        act_and_wait(lambda: pyautogui.press(viewport), timeout=3)
+
+    def _balls(self):
+        """Bolinhas na tela atual (só usado quando o slider não tem recorte)"""
+        frame = self.locator.capture_frame()
+        result = self.locator.find_all_with_template(frame, BALL_TEMPLATE)
+        return result['matches'] if result['found'] else []
+
+    def _field(self, slider_idx, viewport):
+        """Recorte do slider, se ele foi lido nesta mesma posição da tela"""
+        field = self.fields[slider_idx] if slider_idx < len(self.fields) else None
+        return field if field is not None and field['viewport'] == viewport else None
+
+    def measure(self, slider_idx, field):
+        """
+        Calibra um slider: com ele em foco, Home e End levam a bolinha aos
+        extremos; mede a posição dela e lê o valor em cada ponta. Um
+        PageDown a partir do máximo mede quantos passos anda uma página.
+        Deixa o slider uma página abaixo do máximo. Retorna a SliderGeometry ou None.
+        """
+        spec = SLIDER_SPECS[slider_idx]
+        ball = find_ball_in_field(field)
+        if ball is None:
+            return None
+
+        print(f"\n📏 Calibrando slider {slider_idx + 1}...")
+        moverPara(ball['x'], ball['y'])
+        act_and_wait(click, timeout=1, change_timeout=0.3)
+
+        ends = []
+        for key in ('home', 'end'):
+            act_and_wait(lambda: pyautogui.press(key), region=_field_region(field), timeout=2, change_timeout=0.5)
+            ball = find_ball_in_field(field)
+            if ball is None:
+                return None
+            ends.append((ball['x'] - field['screen_box'][0], read_field_value(field)))
+
+        (x_min, minimum), (x_max, maximum) = ends
+
+        act_and_wait(lambda: pyautogui.press('pagedown'), region=_field_region(field), timeout=2, change_timeout=0.5)
+        after_page = read_field_value(field)
+        page_step = None
+        if isinstance(after_page, (int, float)) and isinstance(maximum, (int, float)):
+            page_step = spec.steps_between(after_page, maximum) or None
+
+        self.values[slider_idx] = after_page
+        geometry = slider_calibration.store(spec, x_min, x_max, minimum, maximum, page_step)
+        if geometry is not None:
+            self.specs[slider_idx] = slider_calibration.spec_with_bounds(spec)
+        return geometry
+
+    def _drag(self, slider_idx, field, target):
+        """Arrasta a bolinha até o pixel do alvo e corrige com poucas teclas"""
+        spec = SLIDER_SPECS[slider_idx]
+        geometry = slider_calibration.get(spec)
+        if geometry is None and self.calibrate:
+            geometry = self.measure(slider_idx, field)
+        if geometry is None:
+            return False
+
+        ball = find_ball_in_field(field)
+        if ball is None:
+            return False
+
+        x = field['screen_box'][0] + geometry.offset_for(target)
+        print(f"\n🎯 Slider {slider_idx + 1}: arrastando para x={x} ({geometry.pixels_per_step:.2f} px/passo)")
+        notify(f"Ajustando slider {slider_idx + 1}", title="Elisa", duration=2)
+        moverPara(ball['x'], ball['y'])
+        pyautogui.dragTo(x, ball['y'], duration=0.2, button='left')
+        wait_for_stable_screen(region=_field_region(field), timeout=2, change_timeout=0.3)
+
+        # O slider fica com foco depois do arrasto: o ajuste fino vai direto por teclas
+        value = read_field_value(field)
+        if not spec.matches(value, target):
+            adjust_slider(slider_idx, None, value, target, self.specs[slider_idx])
+            value = read_field_value(field)
+        self.values[slider_idx] = value
+        return True
+
+    def _set(self, slider_idx, viewport, target):
+        """Ajusta um slider e confere relendo só o recorte dele"""
+        spec = self.specs[slider_idx]
+        field = self._field(slider_idx, viewport)
+
+        for attempt in range(self.max_attempts):
+            current = self.values[slider_idx]
+            if spec.matches(current, target):
+                if attempt == 0:
+                    print(f"\n✓ Slider {slider_idx + 1}: já está no valor correto ({current})")
+                return True
+
+            if field is None:
+                # Sem recorte não dá pra conferir: uma tentativa pela ordem das bolinhas
+                candidates = self._balls()
+                position = slider_idx if viewport == 'home' else 0
+                if len(candidates) > position:
+                    adjust_slider(slider_idx, candidates[position], current, target, spec)
                 else:
-                    for _ in range(steps_abs):
-                        pyautogui.press(direction)
-                        time.sleep(0.05)
-                time.sleep(0.5)
-            else:
-                print(f"\n✓ Slider 3: já está no valor correto ({current})")
-    else:
-        print("   ❌ Bolinha 3 não encontrada após End")
-
-    print("\n✅ Ajuste concluído!")
-    notify("Sliders ajustados!", title="Elisa", duration=2)
-
-    # Verifica valores finais
-    print("\n🔍 Verificando valores finais...")
-    final_values = callOCRSliders()
-    print(f"📊 Valores finais: {final_values}")
+                    print(f"   ❌ Bolinha do slider {slider_idx + 1} não encontrada")
+                return False
+
+            if attempt:
+                print(f"   🔁 Slider {slider_idx + 1}: tentativa {attempt + 1} (lido {current})")
+
+            # Primeira tentativa arrastando; as seguintes (ou sem calibração) por teclas
+            if attempt == 0 and self._drag(slider_idx, field, target):
+                continue
+
+            ball = find_ball_in_field(field)
+            if ball is None:
+                print(f"   ❌ Bolinha do slider {slider_idx + 1} não encontrada no recorte")
+                return False
+
+            adjust_slider(slider_idx, ball, self.values[slider_idx], target, spec)
+            self.values[slider_idx] = read_field_value(field)
+
+        return spec.matches(self.values[slider_idx], target)
+
+    def apply(self, target_values):
+        """
+        Leva os sliders aos alvos. Só faz a leitura completa se ainda não
+        houver uma; retorna os valores conferidos.
+        """
+        if not self.fields:
+            self.read()
+
+        if len(self.values) != 3 or len(target_values) != 3:
+            print("❌ Erro: precisa de exatamente 3 valores")
+            return self.values
+
+        print(f"\n🎯 Ajustando sliders:")
+        print(f"   Atual: {self.values}")
+        print(f"   Alvo:  {list(target_values)}")
+
+        # Sliders 1 e 2 aparecem após Home, o 3 após End
+        for viewport, indexes in (('home', (0, 1)), ('end', (2,))):
+            pending = [i for i in indexes if not self.specs[i].matches(self.values[i], target_values[i])]
+            if not pending:
+                continue
+            self._scroll(viewport)
+            for slider_idx in pending:
+                self._set(slider_idx, viewport, target_values[slider_idx])
+
+        print("\n✅ Ajuste concluído!")
+        notify("Sliders ajustados!", title="Elisa", duration=2)
+        print(f"📊 Valores finais: {self.values}")
+        return self.values
+
+
+def adjust_sliders_to_target(target_values, calibrate=True):
+    """
+    Ajusta os sliders pros valores desejados
+    target_values: lista com 3 valores [input1, input2, input3]
+    calibrate: mede a geometria do slider (uma vez por resolução) para arrastar
+    """
+    if templates.get(BALL_TEMPLATE) is None:
+        print(f"❌ Template não encontrado: {BALL_TEMPLATE}")
+        return
+
+    return SliderController(calibrate=calibrate).apply(target_values)
 
 if __name__ == "__main__":
     time.sleep(2)
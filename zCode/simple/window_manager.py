@@ -30,3 +30,32 @@ def activate_and_maximize_scene_window():
     except Exception as e:
         print(f"❌ Erro ao ativar janela: {e}")
         return False
+
+
+def get_scene_window_bounds():
+    """
+    Retorna (left, top, width, height) da janela SCENE, ou None se não encontrar.
+    Janelas maximizadas no Windows ficam com bordas negativas (-8px), então
+    o retângulo é recortado para dentro da tela.
+    """
+    try:
+        scene_windows = [w for w in gw.getAllWindows() if "SCENE" in w.title.upper()]
+        if not scene_windows:
+            return None
+
+        window = scene_windows[0]
+        screen_width, screen_height = pyautogui.size()
+
+        left = max(0, window.left)
+        top = max(0, window.top)
+        right = min(screen_width, window.left + window.width)
+        bottom = min(screen_height, window.top + window.height)
+
+        if right <= left or bottom <= top:
+            return None
+
+        return left, top, right - left, bottom - top
+
+    except Exception as e:
+        print(f"❌ Erro ao ler posição da janela: {e}")
+        return None
@@ -0,0 +1,97 @@
+# slider_calibration.py
+from display_profile import display_profile
+from slider_planner import SliderSpec
+
+
+class SliderGeometry:
+    """
+    Geometria medida de um slider: onde a bolinha fica no mínimo e no máximo
+    e quantos passos anda um PageUp/PageDown (page_step, None se não medido).
+
+    As posições x são relativas à borda esquerda do recorte do slider
+    (screen_box do read_slider_fields), então continuam valendo se o
+    diálogo aparecer em outro lugar da tela. O valor é linear no pixel.
+    """
+
+    def __init__(self, x_min, x_max, minimum, maximum, step, page_step=None):
+        self.x_min = x_min
+        self.x_max = x_max
+        self.minimum = minimum
+        self.maximum = maximum
+        self.step = step
+        self.page_step = page_step
+
+    @property
+    def pixels_per_step(self):
+        """Quantos pixels a bolinha anda por passo"""
+        steps = (self.maximum - self.minimum) / self.step
+        return (self.x_max - self.x_min) / steps if steps else 0.0
+
+    def offset_for(self, value):
+        """Posição x (relativa ao recorte) da bolinha para um valor"""
+        value = min(max(value, self.minimum), self.maximum)
+        fraction = (value - self.minimum) / (self.maximum - self.minimum)
+        return int(round(self.x_min + fraction * (self.x_max - self.x_min)))
+
+    def to_dict(self):
+        return {
+            'x_min': self.x_min,
+            'x_max': self.x_max,
+            'minimum': self.minimum,
+            'maximum': self.maximum,
+            'step': self.step,
+            'page_step': self.page_step
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['x_min'], data['x_max'], data['minimum'], data['maximum'], data['step'],
+                   data.get('page_step'))
+
+
+class SliderCalibration:
+    """
+    Calibração dos sliders por resolução (seção 'sliders' do display_profile).
+
+    A medição em si (Home/End no slider com foco, achar a bolinha e ler o
+    valor) fica com quem controla a tela; aqui só se valida e guarda.
+    """
+
+    SECTION = 'sliders'
+
+    def get(self, spec):
+        """Geometria salva para o slider (ou None se ainda não calibrado)"""
+        data = display_profile.get(self.SECTION, spec.name)
+        if data is None or data.get('step') != spec.step:
+            return None
+        return SliderGeometry.from_dict(data)
+
+    def store(self, spec, x_min, x_max, minimum, maximum, page_step=None):
+        """Valida e guarda uma medição; retorna a SliderGeometry ou None se não fizer sentido"""
+        numbers = all(isinstance(v, (int, float)) for v in (minimum, maximum))
+        if not numbers or maximum <= minimum or x_max <= x_min:
+            print(f"   ⚠️  Calibração inválida de {spec.name}: x {x_min}-{x_max}, valores {minimum}-{maximum}")
+            return None
+
+        if page_step is not None and page_step <= 0:
+            page_step = None
+
+        geometry = SliderGeometry(int(x_min), int(x_max), float(minimum), float(maximum), spec.step, page_step)
+        display_profile.set(self.SECTION, spec.name, geometry.to_dict())
+        print(f"📏 {spec.name}: {minimum} → {maximum}, {geometry.pixels_per_step:.2f} px/passo, página = {page_step} passos")
+        return geometry
+
+    def forget(self, spec):
+        """Descarta a calibração (ex.: o diálogo mudou de layout)"""
+        display_profile.set(self.SECTION, spec.name, None)
+
+    def spec_with_bounds(self, spec):
+        """SliderSpec com mínimo/máximo e página calibrados (libera Home/End e PageUp/PageDown no planejador)"""
+        geometry = self.get(spec)
+        if geometry is None:
+            return spec
+        return SliderSpec(spec.name, spec.step, geometry.minimum, geometry.maximum, geometry.page_step)
+
+
+# Instância global única
+slider_calibration = SliderCalibration()
@@ -0,0 +1,115 @@
+# slider_planner.py
+from simple.moves import press
+
+
+class SliderSpec:
+    """
+    Descrição de um slider do diálogo de registro do SCENE.
+
+    step: incremento de uma seta (left/right)
+    minimum / maximum: valores em Home / End. None = desconhecido, e aí o
+        planejador não usa Home/End (não dá pra saber onde eles caem)
+    page_step: quantos passos um PageUp/PageDown anda, medido na calibração
+        (slider_calibration). None = desconhecido, e aí só usa as setas
+    """
+
+    def __init__(self, name, step, minimum=None, maximum=None, page_step=None):
+        self.name = name
+        self.step = step
+        self.minimum = minimum
+        self.maximum = maximum
+        self.page_step = page_step
+
+    def steps_between(self, start, end):
+        """Quantos passos inteiros separam dois valores"""
+        return int(round((end - start) / self.step))
+
+    def matches(self, value, target):
+        """O valor lido bate com o alvo (meio passo de tolerância)"""
+        return isinstance(value, (int, float)) and abs(value - target) <= self.step / 2
+
+
+# Acima disso o valor lido quase certamente é erro de OCR: o slider não é tocado
+MAX_STEPS = 1000
+
+
+SLIDER_SPECS = [
+    SliderSpec('subamostra_nao_refinado', step=0.005),
+    SliderSpec('confiabilidade', step=0.05),
+    SliderSpec('subamostra_refinado', step=0.001),
+]
+
+
+def _relative_plan(steps, spec, start):
+    """Melhor sequência para andar `steps` passos a partir de `start` (setas + páginas)"""
+    if steps == 0:
+        return []
+
+    arrow, opposite = ('right', 'left') if steps > 0 else ('left', 'right')
+    page_key = 'pageup' if steps > 0 else 'pagedown'
+    distance = abs(steps)
+
+    if not spec.page_step or distance < spec.page_step:
+        return [(arrow, distance)]
+
+    pages, rest = divmod(distance, spec.page_step)
+    options = [[(page_key, pages), (arrow, rest)]]
+
+    # Passar uma página do alvo e voltar com setas, se não bater no limite do slider
+    bounds_known = spec.minimum is not None and spec.maximum is not None
+    if rest and bounds_known:
+        overshoot = start + (steps / distance) * (pages + 1) * spec.page_step * spec.step
+        if spec.minimum <= overshoot <= spec.maximum:
+            options.append([(page_key, pages + 1), (opposite, spec.page_step - rest)])
+
+    best = min(options, key=plan_cost)
+    return [(key, count) for key, count in best if count > 0]
+
+
+def is_plausible(current, target, spec):
+    """
+    O movimento faz sentido? Recusa leituras fora do intervalo calibrado e
+    distâncias de mais de MAX_STEPS passos (um OCR ruim mandaria milhares
+    de teclas).
+    """
+    for value in (current, target):
+        if spec.minimum is not None and value < spec.minimum - spec.step:
+            return False
+        if spec.maximum is not None and value > spec.maximum + spec.step:
+            return False
+    return abs(spec.steps_between(current, target)) <= MAX_STEPS
+
+
+def plan_cost(plan):
+    """Número total de teclas do plano"""
+    return sum(count for _, count in plan)
+
+
+def plan_keys(current, target, spec):
+    """
+    Escolhe a sequência de teclas mais curta para levar o slider de current a target.
+
+    Compara: andar direto a partir do valor atual, Home + andar a partir do
+    mínimo e End + andar a partir do máximo (os dois últimos só se o
+    intervalo do slider for conhecido). Em cada caso usa páginas e setas.
+    Retorna lista de (tecla, repetições).
+    """
+    candidates = [_relative_plan(spec.steps_between(current, target), spec, current)]
+
+    if spec.minimum is not None:
+        candidates.append([('home', 1)] + _relative_plan(spec.steps_between(spec.minimum, target), spec, spec.minimum))
+    if spec.maximum is not None:
+        candidates.append([('end', 1)] + _relative_plan(spec.steps_between(spec.maximum, target), spec, spec.maximum))
+
+    return min(candidates, key=plan_cost)
+
+
+def send_plan(plan, interval=0.01):
+    """Envia o plano em rajadas: uma chamada por tecla, com todas as repetições"""
+    for key, count in plan:
+        press(key, presses=count, interval=interval)
+
+
+def describe_plan(plan):
+    """Texto curto do plano, para log"""
+    return ", ".join(f"{key} x{count}" for key, count in plan) or "nada"
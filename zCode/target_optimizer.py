@@ -1,8 +1,6 @@
 # target_optimizer.py
 import numpy as np
 from typing import Tuple, List, Optional
-from skopt import gp_minimize
-from skopt.space import Real
 from context import context
 from database_manager import DatabaseManager
 from context import context
@@ -116,6 +114,10 @@ class TargetOptimizer:
         Returns:
             Tupla (x1, x3) sugerida
         """
+        # skopt só é importado aqui (o import sozinho leva alguns segundos)
+        from skopt import gp_minimize
+        from skopt.space import Real
+
         # Define espaço de busca
         space = [
             Real(self.x1_min, self.x1_max, name='x1'),
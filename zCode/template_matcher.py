@@ -1,12 +1,15 @@
 # template_matcher.py
 import cv2
-import numpy as np
 from pathlib import Path
+from frame import as_frame
+from template_registry import templates
+from matching import match_template, suppress_boxes
 
 class TemplateMatcher:
-    def __init__(self, template_paths, threshold=0.8, offset_width=50, offset_height=50):
+    def __init__(self, template_paths, threshold=None, offset_width=50, offset_height=50):
         """
-        template_paths: dict com {nome: caminho} dos templates
+        template_paths: dict com {nome: template} — nome em buttons/ ou caminho do PNG
+        threshold: se None, cada template usa o threshold do manifest.json
         """
         self.templates = {}
         self.threshold = threshold
@@ -16,124 +19,75 @@ class TemplateMatcher:
         print(f"🔍 Carregando {len(template_paths)} template(s)...")
 
         for name, path in template_paths.items():
-            template_path = Path(path)
-            if not template_path.exists():
+            template = templates.get(path)
+            if template is None:
                 print(f"   ⚠️  Template não encontrado: {name} ({path})")
                 continue
 
-            template = cv2.imread(str(template_path), cv2.IMREAD_COLOR)
-            template_gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
-            h, w = template_gray.shape
-
             self.templates[name] = {
-                'image': template,
-                'gray': template_gray,
-                'width': w,
-                'height': h,
-                'path': template_path
+                'image': template.bgr,
+                'gray': template.gray,
+                'mask': template.mask,
+                'width': template.width,
+                'height': template.height,
+                'threshold': template.threshold if threshold is None else threshold,
+                'path': template.path,
+                'template': template
             }
 
-            print(f"   ✓ {name}: {w}x{h}px")
+            print(f"   ✓ {name}: {template.width}x{template.height}px")
 
         print(f"✓ {len(self.templates)} template(s) carregado(s)")
         print(f"  Offset: largura +{self.offset_width}px, altura +{self.offset_height}px")
 
     def _non_maximum_suppression(self, matches, overlap_threshold=0.7):
-        """Remove matches duplicados que se sobrepõem"""
+        """Remove matches duplicados que se sobrepõem (NMS vetorizado, ver matching.py)"""
         if len(matches) == 0:
             return []
 
-        matches = sorted(matches, key=lambda x: x['confidence'], reverse=True)
-
-        keep = []
-
-        for match in matches:
-            x1, y1 = match['x'], match['y']
-            x2, y2 = x1 + match['width'], y1 + match['height']
-
-            overlap = False
-
-            for kept_match in keep:
-                kx1, ky1 = kept_match['x'], kept_match['y']
-                kx2, ky2 = kx1 + kept_match['width'], ky1 + kept_match['height']
-
-                # Distância entre centros
-                center_x = (x1 + x2) / 2
-                center_y = (y1 + y2) / 2
-                kept_center_x = (kx1 + kx2) / 2
-                kept_center_y = (ky1 + ky2) / 2
-
-                distance = ((center_x - kept_center_x)**2 + (center_y - kept_center_y)**2)**0.5
-
-                if distance < 30:
-                    overlap = True
-                    break
-
-                # Calcula interseção
-                ix1 = max(x1, kx1)
-                iy1 = max(y1, ky1)
-                ix2 = min(x2, kx2)
-                iy2 = min(y2, ky2)
-
-                if ix1 < ix2 and iy1 < iy2:
-                    intersection = (ix2 - ix1) * (iy2 - iy1)
-                    area1 = (x2 - x1) * (y2 - y1)
-                    area2 = (kx2 - kx1) * (ky2 - ky1)
-
-                    iou = intersection / min(area1, area2)
+        boxes = [(m['x'], m['y'], m['x'] + m['width'], m['y'] + m['height']) for m in matches]
+        scores = [m['confidence'] for m in matches]
 
-                    if iou > overlap_threshold:
-                        overlap = True
-                        break
+        keep = suppress_boxes(boxes, scores, overlap_threshold=overlap_threshold, min_center_distance=30)
+        return [matches[i] for i in keep]
 
-            if not overlap:
-                keep.append(match)
-
-        return keep
-
-    def find_matches_in_image(self, image_path):
-        """Encontra todas as ocorrências de TODOS os templates em uma imagem"""
-        image = cv2.imread(str(image_path), cv2.IMREAD_COLOR)
-        image_gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    def find_matches_in_image(self, image):
+        """Encontra todas as ocorrências de TODOS os templates em uma imagem (Frame, array ou caminho)"""
+        frame = as_frame(image)
 
         all_matches = []
 
         for template_name, template_data in self.templates.items():
-            template_gray = template_data['gray']
-
-            result = cv2.matchTemplate(image_gray, template_gray, cv2.TM_CCOEFF_NORMED)
-
-            locations = np.where(result >= self.threshold)
-
-            for pt in zip(*locations[::-1]):
-                confidence = result[pt[1], pt[0]]
+            # Busca grosso-fino (pirâmide + escala da tela), já sem duplicatas do mesmo template
+            matches = match_template(frame, template_data['template'], template_data['threshold'], min_distance=30)
 
-                all_matches.append({
-                    'template': template_name,
-                    'x': int(pt[0]),
-                    'y': int(pt[1]),
-                    'width': template_data['width'],
-                    'height': template_data['height'],
-                    'confidence': float(confidence)
-                })
+            for match in matches:
+                match['template'] = template_name
+                all_matches.append(match)
 
         unique_matches = self._non_maximum_suppression(all_matches, overlap_threshold=0.7)
 
         return unique_matches
 
-    def search_in_screenshots(self, screenshot_paths, save_dir="./salvos"):
-        """Busca templates em múltiplos screenshots e salva recortes"""
-        save_dir = Path(save_dir)
-        save_dir.mkdir(exist_ok=True)
+    def search_in_screenshots(self, screenshots, save_dir=None):
+        """
+        Busca templates em múltiplos screenshots e devolve os recortes em memória.
+        screenshots: lista de Frames (ou caminhos, por compatibilidade)
+        save_dir: se informado, também salva os recortes pos-templateN.png (debug)
+        """
+        if save_dir is not None:
+            save_dir = Path(save_dir)
+            save_dir.mkdir(exist_ok=True)
 
         all_results = []
         all_crops = []
         crop_counter = 1
 
-        for screenshot_path in screenshot_paths:
-            print(f"\n📸 Analisando: {screenshot_path.name}")
+        for screenshot in screenshots:
+            frame = as_frame(screenshot)
+            print(f"\n📸 Analisando: {frame.name}")
 
-            matches = self.find_matches_in_image(screenshot_path)
+            matches = self.find_matches_in_image(frame)
 
             if matches:
                 # ORDENA DE CIMA PRA BAIXO
@@ -141,8 +95,6 @@ class TemplateMatcher:
 
                 print(f"   ✓ Encontrados {len(matches)} input(s)")
 
-                image = cv2.imread(str(screenshot_path))
-
                 for match in matches:
                     template_name = match['template']
                     x, y = match['x'], match['y']
@@ -153,20 +105,24 @@ class TemplateMatcher:
 
                     x1 = max(0, x - self.offset_width)
                     y1 = max(0, y - self.offset_height)
-                    x2 = min(image.shape[1], x + w + self.offset_width)
-                    y2 = min(image.shape[0], y + h + self.offset_height)
+                    x2 = min(frame.width, x + w + self.offset_width)
+                    y2 = min(frame.height, y + h + self.offset_height)
 
-                    crop = image[y1:y2, x1:x2]
+                    # View do array, sem cópia
+                    crop = frame.crop(x1, y1, x2, y2)
+                    all_crops.append(crop)
 
-                    crop_filename = f"pos-template{crop_counter}.png"
-                    crop_path = save_dir / crop_filename
-                    cv2.imwrite(str(crop_path), crop)
+                    match['crop'] = crop
+                    match['crop_box'] = (x1, y1, x2, y2)
+                    match['screen_box'] = frame.to_screen(x1, y1) + frame.to_screen(x2, y2)
+                    match['screenshot'] = frame.name
 
-                    all_crops.append(crop_path)
-                    crop_counter += 1
+                    if save_dir is not None:
+                        crop_path = save_dir / f"pos-template{crop_counter}.png"
+                        cv2.imwrite(str(crop_path), crop)
+                        match['crop_path'] = crop_path
 
-                    match['crop_path'] = crop_path
-                    match['screenshot'] = screenshot_path.name
+                    crop_counter += 1
 
                 all_results.extend(matches)
             else:
@@ -176,6 +132,7 @@ class TemplateMatcher:
 
         print(f"\n{'='*60}")
         print(f"Total geral: {total_found} input(s) encontrado(s)")
-        print(f"Recortes salvos: {len(all_crops)}")
+        if save_dir is not None:
+            print(f"Recortes salvos: {len(all_crops)}")
 
         return total_found, all_results, all_crops
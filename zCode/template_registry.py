@@ -0,0 +1,159 @@
+# template_registry.py
+import json
+import os
+import threading
+from pathlib import Path
+import cv2
+import numpy as np
+
+# Pasta buttons/ na raiz do projeto (um nível acima de zCode/)
+BUTTONS_DIR = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) / "buttons"
+MANIFEST_NAME = "manifest.json"
+
+
+class Template:
+    """
+    Um template de botão já carregado em memória.
+
+    bgr / gray: imagens prontas para cv2.matchTemplate
+    mask: máscara do canal alfa (None quando o PNG é totalmente opaco)
+    threshold / region / scale: metadados vindos do manifest.json
+    """
+
+    def __init__(self, name, path, bgr, mask=None, threshold=0.7, region=None, scale=1.0):
+        if scale != 1.0:
+            bgr = cv2.resize(bgr, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            if mask is not None:
+                mask = cv2.resize(mask, (bgr.shape[1], bgr.shape[0]), interpolation=cv2.INTER_NEAREST)
+
+        self.name = name
+        self.path = Path(path)
+        self.bgr = bgr
+        self.gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+        self.mask = mask
+        self.threshold = threshold
+        self.region = region
+        self.scale = scale
+        self.height, self.width = self.gray.shape
+        self._scaled = {1.0: (self.gray, self.mask)}
+
+    def scaled(self, scale):
+        """(cinza, máscara) redimensionados por scale, com cache por escala"""
+        scale = round(float(scale), 4)
+        if scale not in self._scaled:
+            interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+            size = (max(1, round(self.width * scale)), max(1, round(self.height * scale)))
+            gray = cv2.resize(self.gray, size, interpolation=interpolation)
+            mask = None
+            if self.mask is not None:
+                mask = cv2.resize(self.mask, size, interpolation=cv2.INTER_NEAREST)
+            self._scaled[scale] = (gray, mask)
+        return self._scaled[scale]
+
+    def __repr__(self):
+        return f"Template({self.name!r}, {self.width}x{self.height}, threshold={self.threshold})"
+
+
+class TemplateRegistry:
+    """
+    Carrega todos os PNGs de buttons/ uma única vez e guarda as variações
+    BGR, cinza e máscara. Os metadados de cada template (threshold, região
+    esperada e escala) vêm de buttons/manifest.json; o que não estiver lá
+    usa os valores de "_default".
+    """
+
+    def __init__(self, buttons_dir=BUTTONS_DIR):
+        self.buttons_dir = Path(buttons_dir)
+        self._templates = None
+        self._manifest = None
+        self._lock = threading.Lock()
+
+    def _load_manifest(self):
+        manifest_path = self.buttons_dir / MANIFEST_NAME
+        if not manifest_path.exists():
+            return {}
+        with open(manifest_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _metadata(self, name):
+        defaults = {'threshold': 0.7, 'region': None, 'scale': 1.0}
+        defaults.update(self._manifest.get('_default', {}))
+        defaults.update(self._manifest.get(name, {}))
+        return defaults
+
+    def _read(self, name, path):
+        """Lê o PNG (com alfa, se tiver) e monta o Template"""
+        image = cv2.imread(str(path), cv2.IMREAD_UNCHANGED)
+        if image is None:
+            print(f"   ⚠️  Template não encontrado: {name} ({path})")
+            return None
+
+        mask = None
+        if image.ndim == 2:
+            bgr = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        elif image.shape[2] == 4:
+            bgr = cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+            alpha = image[:, :, 3]
+            # Só usa máscara se o PNG realmente tiver transparência
+            if alpha.min() < 255:
+                mask = np.where(alpha > 0, 255, 0).astype(np.uint8)
+        else:
+            bgr = image
+
+        meta = self._metadata(name)
+        return Template(name, path, bgr, mask, meta['threshold'], meta['region'], meta['scale'])
+
+    def _ensure_loaded(self):
+        if self._templates is not None:
+            return
+        with self._lock:
+            if self._templates is not None:
+                return
+            self._manifest = self._load_manifest()
+            templates = {}
+            for path in sorted(self.buttons_dir.glob("*.png")):
+                template = self._read(path.stem, path)
+                if template is not None:
+                    templates[path.stem] = template
+            self._templates = templates
+            print(f"✓ {len(templates)} template(s) carregado(s) de {self.buttons_dir}")
+
+    def get(self, template):
+        """
+        Retorna o Template pelo nome ('registro_automatico'), nome de arquivo
+        ('registro_automatico.png') ou caminho completo. Caminhos fora de
+        buttons/ são carregados na primeira vez e guardados também.
+        Retorna None se o arquivo não existir.
+        """
+        if isinstance(template, Template):
+            return template
+
+        self._ensure_loaded()
+        path = Path(template)
+        name = path.stem
+
+        if name in self._templates and (path.parent == Path('.') or path.parent.resolve() == self.buttons_dir.resolve()):
+            return self._templates[name]
+
+        key = str(path.resolve())
+        if key not in self._templates:
+            loaded = self._read(name, path)
+            if loaded is None:
+                return None
+            self._templates[key] = loaded
+        return self._templates[key]
+
+    def names(self):
+        """Nomes de todos os templates de buttons/"""
+        self._ensure_loaded()
+        return [name for name, t in self._templates.items() if t.path.parent == self.buttons_dir]
+
+    def reload(self):
+        """Descarta o cache e relê a pasta e o manifest"""
+        with self._lock:
+            self._templates = None
+            self._manifest = None
+
+
+# Instância global única
+templates = TemplateRegistry()
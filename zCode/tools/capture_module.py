@@ -1,9 +1,8 @@
 # capture_module.py
 import pyautogui
-import time
 from pathlib import Path
-import win32gui
-import win32con
+from frame import Frame
+from waits import act_and_wait
 
 class PageCapture:
     def __init__(self, save_dir="./salvos"):
@@ -20,36 +19,36 @@ class PageCapture:
         """Dá um clique na página para ativá-la"""
         screen_width, screen_height = pyautogui.size()
         # Clica no centro da tela
-        pyautogui.click(screen_width // 2, screen_height // 2)
-        time.sleep(0.3)
+        act_and_wait(lambda: pyautogui.click(screen_width // 2, screen_height // 2), timeout=1, change_timeout=0.3)
         print("✓ Clique de ativação realizado")
 
-    def capture_initial_screenshots(self):
-        """Captura os dois prints iniciais"""
+    def capture_initial_screenshots(self, save=False):
+        """
+        Captura os dois prints iniciais (após Home e após End) como Frames em memória.
+        save=True também grava pre-template1/2.png em save_dir (debug)
+        """
         screenshots = []
 
         # Pressiona Home
-        pyautogui.press('home')
-        time.sleep(0.5)
+        act_and_wait(lambda: pyautogui.press('home'), timeout=2)
         print("✓ Home pressionado")
 
         # Primeiro print
-        screenshot1 = pyautogui.screenshot()
-        path1 = self.save_dir / "pre-template1.png"
-        screenshot1.save(path1)
-        screenshots.append(path1)
-        print(f"✓ Screenshot 1 salvo: {path1}")
+        frame1 = Frame.from_pil(pyautogui.screenshot(), "pre-template1.png")
+        if save:
+            frame1.save(self.save_dir / frame1.name)
+            print(f"✓ Screenshot 1 salvo: {self.save_dir / frame1.name}")
+        screenshots.append(frame1)
 
         # Pressiona end
-        pyautogui.press('end')
-        time.sleep(0.5)
+        act_and_wait(lambda: pyautogui.press('end'), timeout=2)
         print("✓ PageDown pressionado")
 
         # Segundo print
-        screenshot2 = pyautogui.screenshot()
-        path2 = self.save_dir / "pre-template2.png"
-        screenshot2.save(path2)
-        screenshots.append(path2)
-        print(f"✓ Screenshot 2 salvo: {path2}")
+        frame2 = Frame.from_pil(pyautogui.screenshot(), "pre-template2.png")
+        if save:
+            frame2.save(self.save_dir / frame2.name)
+            print(f"✓ Screenshot 2 salvo: {self.save_dir / frame2.name}")
+        screenshots.append(frame2)
 
         return screenshots
@@ -0,0 +1,174 @@
+# ocr_benchmark.py
+"""
+Benchmark dos motores de OCR por tarefa, em recortes gravados.
+
+Estrutura esperada (uma pasta por tarefa de ocr_engines.OCR_TASKS):
+
+    gravados/
+        slider_digits/   0001.png, 0002.png, ...  + labels.json
+        cluster_names/   ...                       + labels.json
+        report_values/   ...                       + labels.json
+
+labels.json: {"0001.png": "0.125", ...} com o texto esperado de cada recorte
+(em cluster_names, o nome do cluster como enumerate_clusters devolve).
+
+Cada tarefa é medida pelo mesmo caminho que a automação usa:
+    slider_digits   recortes de slider -> OCRAnalyzer.read_values (3 por vez)
+    report_values   células de valor   -> ReportReader.read_cell
+    cluster_names   prints de tela     -> OCRIndex + enumerate_clusters
+    button_text,
+    report_labels   prints de tela     -> OCRIndex.find
+
+Uso (de dentro de zCode/):
+    python -m tools.ocr_benchmark gravados --min-accuracy 0.95 --save
+"""
+import argparse
+import json
+import re
+import statistics
+import time
+from pathlib import Path
+import cv2
+from cluster_names import enumerate_clusters
+from ocr_analyzer_for_sliders import OCRAnalyzer
+from ocr_engines import ENGINES, OCR_TASKS, ocr_engines
+from ocr_index import OCRIndex, normalize_text
+from ocr_readers import ocr_readers
+from report_reader import ReportReader
+
+# Tarefas cujo esperado é um número
+NUMBER_TASKS = ('slider_digits', 'report_values')
+
+# callOCRSliders lê os 3 sliders numa chamada só
+SLIDERS_PER_READ = 3
+
+
+def _as_number(text):
+    numbers = re.findall(r'-?\d+(?:[.,]\d+)?', text or "")
+    return float(numbers[0].replace(',', '.')) if numbers else None
+
+
+def load_samples(task_dir, task):
+    """[(nome, imagem BGR, texto esperado)] de uma pasta de tarefa"""
+    labels_path = task_dir / "labels.json"
+    if not labels_path.exists():
+        return []
+    with open(labels_path, encoding='utf-8') as f:
+        labels = json.load(f)
+
+    samples = []
+    for name, expected in sorted(labels.items()):
+        if task in NUMBER_TASKS and _as_number(str(expected)) is None:
+            print(f"   ⚠️  Rótulo não numérico em {task_dir / name}: {expected!r} (ignorado)")
+            continue
+        image = cv2.imread(str(task_dir / name))
+        if image is None:
+            print(f"   ⚠️  Não consegui ler {task_dir / name}")
+            continue
+        samples.append((name, image, str(expected)))
+    return samples
+
+
+def is_correct(task, result, expected):
+    """Compara o resultado da tarefa com o esperado"""
+    if task in NUMBER_TASKS:
+        wanted = _as_number(expected)
+        return result is not None and abs(result - wanted) < 1e-9
+    if task == 'cluster_names':
+        return any(normalize_text(expected) == normalize_text(name) for name in result)
+    return result is not None
+
+
+def _read_task(engine, task, images, expected):
+    """Lê os recortes pelo caminho de produção da tarefa; uma saída por recorte"""
+    if task == 'slider_digits':
+        return OCRAnalyzer(engine=engine).read_values(images)
+    if task == 'report_values':
+        return [ReportReader.read_cell(image, engine)[0] for image in images]
+    indexes = [OCRIndex.build(image, engine) for image in images]
+    if task == 'cluster_names':
+        return [enumerate_clusters(index) for index in indexes]
+    return [index.find(text) for index, text in zip(indexes, expected)]
+
+
+def run_engine(engine, task, samples):
+    """Roda um motor em todos os recortes; retorna (acurácia, latência mediana em ms por recorte)"""
+    step = SLIDERS_PER_READ if task == 'slider_digits' else 1
+    latencies, hits = [], 0
+    for i in range(0, len(samples), step):
+        batch = samples[i:i + step]
+        expected = [wanted for _, _, wanted in batch]
+        start = time.perf_counter()
+        results = _read_task(engine, task, [image for _, image, _ in batch], expected)
+        latencies.append((time.perf_counter() - start) * 1000 / len(batch))
+        hits += sum(is_correct(task, result, wanted) for result, wanted in zip(results, expected))
+    return hits / len(samples), statistics.median(latencies)
+
+
+def benchmark(base_dir, engines=None, min_accuracy=0.95):
+    """
+    Mede todos os motores em todas as tarefas com recortes gravados.
+    Retorna {tarefa: {'resultados': {motor: (acurácia, ms)}, 'escolhido': motor ou None}}
+    """
+    base_dir = Path(base_dir)
+    names = engines or list(ENGINES)
+    report = {}
+
+    # Com o cache de leituras ligado a passada medida viraria consulta de dicionário
+    cache_enabled = ocr_readers.cache.enabled
+    ocr_readers.cache.enabled = False
+    try:
+        for task in OCR_TASKS:
+            samples = load_samples(base_dir / task, task)
+            if samples:
+                report[task] = _benchmark_task(task, samples, names, min_accuracy)
+    finally:
+        ocr_readers.cache.enabled = cache_enabled
+
+    return report
+
+
+def _benchmark_task(task, samples, names, min_accuracy):
+    """Mede os motores numa tarefa e escolhe o mais rápido com acurácia suficiente"""
+    print(f"\n🧪 {task}: {len(samples)} recorte(s)")
+    results = {}
+    for name in names:
+        if not ENGINES[name].supports(task):
+            continue
+        engine = ENGINES[name].for_task(task)
+        if not engine.available():
+            print(f"   ⏭️  {name}: indisponível nesta máquina")
+            continue
+        # A primeira chamada paga o carregamento do modelo: aquece com um recorte descartado
+        run_engine(engine, task, samples[:1])
+        results[name] = run_engine(engine, task, samples)
+        print(f"   {name:10s} acurácia {results[name][0]:6.1%}  mediana {results[name][1]:8.1f} ms")
+
+    good = [(ms, name) for name, (accuracy, ms) in results.items() if accuracy >= min_accuracy]
+    chosen = min(good)[1] if good else None
+    if chosen:
+        print(f"   ✓ Mais rápido com acurácia ≥ {min_accuracy:.0%}: {chosen}")
+    else:
+        print(f"   ⚠️  Nenhum motor atingiu {min_accuracy:.0%}; mantendo {ocr_engines.engine_name(task)}")
+    return {'resultados': results, 'escolhido': chosen}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos motores de OCR por tarefa")
+    parser.add_argument("base_dir", help="pasta com os recortes gravados (uma subpasta por tarefa)")
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), help="motores a testar (padrão: todos)")
+    parser.add_argument("--min-accuracy", type=float, default=0.95, help="acurácia mínima para um motor ser escolhido")
+    parser.add_argument("--save", action="store_true", help="grava a escolha de cada tarefa no display_profile")
+    args = parser.parse_args()
+
+    report = benchmark(args.base_dir, args.engines, args.min_accuracy)
+
+    if args.save:
+        for task, result in report.items():
+            if result['escolhido']:
+                ocr_engines.set_engine(task, result['escolhido'])
+        print("\n💾 Motores salvos no display_profile")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# viewport_stitch.py
+import cv2
+import numpy as np
+from frame import Frame
+
+# Diferença de cinza a partir da qual um pixel conta como "mudou com a rolagem"
+CHANGE_THRESHOLD = 12
+
+# Altura da faixa usada para achar a sobreposição e confiança mínima do encaixe
+STRIP_HEIGHT = 40
+STRIP_CONFIDENCE = 0.9
+
+
+class VirtualPanel:
+    """
+    O diálogo de registro inteiro num só espaço de coordenadas.
+
+    Junta o print após Home com o trecho novo do print após End (o que
+    apareceu abaixo depois de rolar `scroll` pixels). frame é a imagem
+    costurada; após Home aparecem as linhas virtuais [0, home_height) e
+    após End as linhas [scroll, scroll + home_height).
+    """
+
+    def __init__(self, frame, box, scroll):
+        self.frame = frame
+        self.left, self.top, self.width, self.home_height = box
+        self.scroll = scroll
+
+    def viewport_for(self, y1, y2):
+        """
+        Em qual tela ('home' ou 'end') a faixa virtual [y1, y2) aparece
+        melhor; None se nenhuma mostra pelo menos metade dela.
+        """
+        visible = {
+            'home': min(y2, self.home_height) - max(y1, 0),
+            'end': min(y2, self.scroll + self.home_height) - max(y1, self.scroll)
+        }
+        viewport = max(visible, key=visible.get)
+        return viewport if visible[viewport] * 2 >= y2 - y1 else None
+
+    def to_screen_box(self, x1, y1, x2, y2):
+        """
+        Caixa virtual -> (viewport, caixa na tela naquela viewport), cortada
+        ao que está visível; (None, None) se não couber em nenhuma.
+        """
+        viewport = self.viewport_for(y1, y2)
+        if viewport is None:
+            return None, None
+        dy = 0 if viewport == 'home' else self.scroll
+        y1 = max(y1 - dy, 0)
+        y2 = min(y2 - dy, self.home_height)
+        return viewport, (self.left + x1, self.top + y1, self.left + x2, self.top + y2)
+
+
+def scrolled_box(home, end):
+    """
+    Retângulo (left, top, width, height) que mudou entre os dois prints =
+    área rolada. Fica só com a maior mancha de mudança, então coisas
+    pequenas que mudam sozinhas (relógio, cursor piscando) não contam.
+    """
+    changed = (cv2.absdiff(home.gray, end.gray) > CHANGE_THRESHOLD).astype(np.uint8)
+    if not changed.any():
+        return None
+
+    changed = cv2.dilate(changed, np.ones((15, 15), np.uint8))
+    _, _, stats, _ = cv2.connectedComponentsWithStats(changed)
+    largest = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+    left, top, width, height = stats[largest, :4]
+
+    # Desfaz o crescimento do dilate nas bordas
+    right = min(home.width, left + width - 7)
+    bottom = min(home.height, top + height - 7)
+    left, top = max(0, left + 7), max(0, top + 7)
+    return int(left), int(top), int(right - left), int(bottom - top)
+
+
+def find_scroll(home, end, box):
+    """
+    Quantos pixels o conteúdo subiu entre Home e End: procura a faixa de
+    baixo do print Home dentro do print End. Retorna None se não encaixar.
+    """
+    left, top, width, height = box
+    if height <= STRIP_HEIGHT:
+        return None
+
+    home_area = home.gray[top:top + height, left:left + width]
+    end_area = end.gray[top:top + height, left:left + width]
+    strip = home_area[height - STRIP_HEIGHT:]
+    if strip.std() < 1.0:
+        return None  # faixa lisa encaixa em qualquer lugar
+
+    result = cv2.matchTemplate(end_area, strip, cv2.TM_CCOEFF_NORMED)
+    _, score, _, loc = cv2.minMaxLoc(result)
+    if score < STRIP_CONFIDENCE:
+        return None
+
+    scroll = (height - STRIP_HEIGHT) - loc[1]
+    return scroll if scroll > 0 else None
+
+
+def stitch_viewports(home, end):
+    """
+    Monta o VirtualPanel a partir dos Frames após Home e após End.
+    Retorna None se não der para achar a sobreposição com segurança.
+    """
+    box = scrolled_box(home, end)
+    if box is None:
+        # Nada rolou: o diálogo cabe inteiro na tela
+        return VirtualPanel(home, (0, 0, home.width, home.height), home.height)
+
+    scroll = find_scroll(home, end, box)
+    if scroll is None:
+        print("⚠️  Não foi possível encaixar os prints de Home e End")
+        return None
+
+    left, top, width, height = box
+    home_area = home.bgr[top:top + height, left:left + width]
+    new_rows = end.bgr[top + height - scroll:top + height, left:left + width]
+
+    stitched = Frame(np.vstack([home_area, new_rows]), name="painel_virtual", origin=(left, top))
+    print(f"🧩 Painel virtual: {width}x{stitched.height}px (rolagem de {scroll}px)")
+    return VirtualPanel(stitched, box, scroll)
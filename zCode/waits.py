@@ -0,0 +1,134 @@
+# waits.py
+import time
+import cv2
+import numpy as np
+from frame import capture_frame
+
+# Diferença de cinza (0-255) a partir da qual um pixel conta como mudado
+PIXEL_TOLERANCE = 16
+
+# Quantos pixels mudados bastam para a tela contar como diferente (ignora ruído isolado)
+MIN_CHANGED_PIXELS = 4
+
+# Quanto tempo a tela precisa ficar parada para contar como estável (s)
+QUIET_TIME = 0.5
+
+# Região observada quando ninguém diz qual: só a janela do SCENE
+DEFAULT_REGION = 'scene'
+
+
+def wait_until(predicate, timeout=10.0, poll=0.05, max_poll=1.0, backoff=1.5, description=None):
+    """
+    Espera predicate() retornar algo verdadeiro, com prazo máximo.
+
+    Começa verificando a cada `poll` segundos e vai espaçando (x backoff, até
+    max_poll), então reações rápidas são percebidas na hora e esperas longas
+    não ficam gastando CPU. timeout=None espera para sempre.
+
+    Retorna o último valor do predicate (falso se estourou o prazo).
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    interval = poll
+
+    while True:
+        result = predicate()
+        if result:
+            return result
+
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                if description:
+                    print(f"⚠️  Tempo esgotado ({timeout:.1f}s) esperando: {description}")
+                return result
+            time.sleep(min(interval, remaining))
+        else:
+            time.sleep(interval)
+
+        interval = min(interval * backoff, max_poll)
+
+
+def screen_snapshot(region=None):
+    """
+    Cinza em resolução cheia da região observada (por padrão só a janela do
+    SCENE). Sem redução: um rótulo de progresso ou um spinner de poucos
+    pixels também conta como mudança.
+    """
+    return capture_frame(name="estabilidade", region=region or DEFAULT_REGION).gray
+
+
+def changed_pixels(a, b, tolerance=PIXEL_TOLERANCE):
+    """Quantos pixels diferem mais que tolerance entre duas capturas (tamanhos diferentes = tudo mudou)"""
+    if a.shape != b.shape:
+        return a.size
+    return int(np.count_nonzero(cv2.absdiff(a, b) > tolerance))
+
+
+class ScreenStability:
+    """
+    Predicate "a tela parou de mudar": verdadeiro quando nenhuma captura
+    teve min_pixels pixels diferentes da anterior por pelo menos `quiet`
+    segundos. Tempo, não número de amostras: com polls rápidos, duas
+    capturas iguais a 30 ms uma da outra não dizem nada sobre um SCENE
+    ocupado.
+    """
+
+    def __init__(self, region=None, tolerance=PIXEL_TOLERANCE, quiet=QUIET_TIME, min_pixels=MIN_CHANGED_PIXELS):
+        self.region = region
+        self.tolerance = tolerance
+        self.quiet = quiet
+        self.min_pixels = min_pixels
+        self._previous = None
+        self._last_change = None
+
+    def __call__(self):
+        current = screen_snapshot(self.region)
+        now = time.monotonic()
+        if self._previous is None or changed_pixels(current, self._previous, self.tolerance) >= self.min_pixels:
+            self._last_change = now
+        self._previous = current
+        return now - self._last_change >= self.quiet
+
+
+def wait_for_stable_screen(region=None, timeout=5.0, reference=None, change_timeout=1.0,
+                           tolerance=PIXEL_TOLERANCE, min_pixels=MIN_CHANGED_PIXELS, quiet=QUIET_TIME):
+    """
+    Espera o SCENE reagir e a tela estabilizar (parada por `quiet` segundos).
+
+    Serve para passos sem um sinal próprio de "terminou". Quando se sabe o
+    que deve aparecer (um estado, um texto), espere por isso com
+    wait_until: uma tela parada não garante que o SCENE já reagiu.
+
+    region: o que observar (padrão: janela do SCENE). Quanto menor, mais
+    barata cada captura.
+    reference: captura (screen_snapshot) tirada ANTES da ação. Se vier,
+    primeiro espera (até change_timeout) a tela ficar diferente dela, depois
+    espera estabilizar. Se a ação não muda nada visível, segue depois de
+    change_timeout.
+
+    Retorna True se a tela estabilizou dentro do prazo.
+    """
+    start = time.monotonic()
+
+    if reference is not None:
+        wait_until(
+            lambda: changed_pixels(screen_snapshot(region), reference, tolerance) >= min_pixels,
+            timeout=change_timeout, poll=0.03, max_poll=0.2
+        )
+
+    remaining = max(0.0, timeout - (time.monotonic() - start))
+    return bool(wait_until(
+        ScreenStability(region, tolerance, quiet, min_pixels), timeout=remaining, poll=0.05, max_poll=0.25,
+        description="tela estabilizar"
+    ))
+
+
+def act_and_wait(action, region=None, timeout=5.0, change_timeout=1.0):
+    """
+    Executa a ação (clique, tecla...) e segue assim que o SCENE reagiu:
+    captura a região antes, roda a ação e espera a tela mudar e estabilizar.
+    """
+    reference = screen_snapshot(region)
+    result = action()
+    wait_for_stable_screen(region, timeout=timeout, reference=reference, change_timeout=change_timeout)
+    return result
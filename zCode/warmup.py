@@ -0,0 +1,100 @@
+# warmup.py
+import threading
+import time
+
+# Quanto tempo o Ollama mantém o modelo carregado depois do pré-carregamento
+OLLAMA_KEEP_ALIVE = "30m"
+
+
+def warm_ocr_readers():
+    """Carrega os leitores EasyOCR usados pela automação (tela e sliders)"""
+    from ocr_engines import OCR_TASKS, engine_for
+    from ocr_readers import get_reader
+    from digit_glyphs import digit_glyphs
+
+    for task in OCR_TASKS:
+        engine = engine_for(task)
+        # Glifos caem no EasyOCR do fallback quando não reconhecem
+        engine = getattr(engine, 'fallback', engine)
+        if engine.name == 'easyocr':
+            get_reader(engine.languages, engine.gpu)
+    digit_glyphs.is_empty()
+
+
+def warm_optimizer():
+    """Importa o scikit-optimize (o import sozinho leva alguns segundos)"""
+    import skopt  # noqa: F401
+
+
+def warm_llm(model):
+    """Pede para o Ollama carregar o modelo agora (prompt vazio só carrega)"""
+    import ollama
+
+    ollama.generate(model=model, prompt="", keep_alive=OLLAMA_KEEP_ALIVE)
+
+
+class Warmup:
+    """
+    Aquecimento em segundo plano no início da automação.
+
+    Cada tarefa roda na sua thread (daemon) enquanto a janela do SCENE é
+    ativada e a StatusWindow aparece, então o primeiro cluster não paga o
+    carregamento do OCR, do skopt nem do modelo do Ollama. Erros são só
+    registrados: quem precisar do recurso depois carrega do jeito normal.
+    """
+
+    def __init__(self, llm_model="gemma3:12b"):
+        self.tasks = {
+            'ocr': warm_ocr_readers,
+            'skopt': warm_optimizer,
+            'ollama': lambda: warm_llm(llm_model)
+        }
+        self.durations = {}
+        self.errors = {}
+        self._threads = {}
+
+    def _run(self, name, task):
+        start = time.perf_counter()
+        try:
+            task()
+        except Exception as e:
+            self.errors[name] = e
+            print(f"⚠️  Aquecimento '{name}' falhou: {e}")
+        self.durations[name] = time.perf_counter() - start
+
+    def start(self):
+        """Dispara todas as tarefas e retorna na hora"""
+        for name, task in self.tasks.items():
+            thread = threading.Thread(target=self._run, args=(name, task), name=f"warmup-{name}", daemon=True)
+            self._threads[name] = thread
+            thread.start()
+        print(f"🔥 Aquecendo em segundo plano: {', '.join(self.tasks)}")
+        return self
+
+    def wait(self, timeout=None):
+        """Espera o aquecimento terminar (True se tudo terminou no prazo)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads.values():
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            thread.join(remaining)
+        return self.done()
+
+    def done(self):
+        return all(not thread.is_alive() for thread in self._threads.values())
+
+    def summary(self):
+        """Texto curto com o tempo de cada tarefa, para log"""
+        parts = []
+        for name in self.tasks:
+            if name in self.errors:
+                parts.append(f"{name}: erro")
+            elif name in self.durations:
+                parts.append(f"{name}: {self.durations[name]:.1f}s")
+            else:
+                parts.append(f"{name}: em andamento")
+        return ", ".join(parts)
+
+
+def start_warmup(llm_model="gemma3:12b"):
+    """Cria e dispara o aquecimento"""
+    return Warmup(llm_model).start()